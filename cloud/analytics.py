@@ -7,6 +7,7 @@ import json
 import time
 import logging
 import random
+from contextlib import nullcontext
 from logging.handlers import RotatingFileHandler
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional
@@ -47,21 +48,56 @@ logger.addHandler(stream_handler)
 
 # === Predictive Maintenance Integration ===
 try:
-    from predictive_maintenance.copernicus_fetcher import fetch_dust_forecast
+    from predictive_maintenance.copernicus_fetcher import safe_fetch_forecast
     PREDICTIVE_AVAILABLE = True
     logger.info("Copernicus integration enabled")
 except ImportError as e:
     PREDICTIVE_AVAILABLE = False
     logger.warning("Copernicus integration disabled: %s", str(e))
 
+# === Telemetry Wire Format ===
+try:
+    from telemetry.wire_format import KIND_ANALYSIS, encode as encode_batch
+    WIRE_FORMAT_AVAILABLE = True
+except ImportError as e:
+    WIRE_FORMAT_AVAILABLE = False
+    logger.warning("Binary wire format disabled, using JSON: %s", str(e))
+
+# === Sensor Fault Detection ===
+try:
+    from cloud.fault_detection import FaultDetector, is_blocking
+    FAULT_DETECTION_AVAILABLE = True
+except ImportError as e:
+    FAULT_DETECTION_AVAILABLE = False
+    logger.warning("Sensor fault detection disabled: %s", str(e))
+
+# === Profiling Instrumentation ===
+try:
+    from instrumentation.profiling import CycleProfiler, install_profiler
+    PROFILING_AVAILABLE = True
+except ImportError as e:
+    PROFILING_AVAILABLE = False
+    logger.warning("Cycle profiling disabled: %s", str(e))
+
 class AnalyticsEngine:
     def __init__(self):
         self.executor = ThreadPoolExecutor(max_workers=4)
+        self.fault_detector = FaultDetector() if FAULT_DETECTION_AVAILABLE else None
+        self.profiler = CycleProfiler(
+            "analytics", budget=ANALYSIS_INTERVAL, log=logger.getChild("Profiling")
+        ) if PROFILING_AVAILABLE else None
+        self.cycles = 0
+
+    def _stage(self, name: str):
+        return self.profiler.stage(name) if self.profiler else nullcontext()
 
     def analyze_node_data(self, node_id: str, data: List[float], 
-                         dust_risk: Optional[float] = None) -> Dict:
+                         dust_risk: Optional[float] = None,
+                         fault_reasons: Optional[List[str]] = None) -> Dict:
         """
-        Analyze sensor data with production-grade error handling
+        Analyze sensor data with production-grade error handling.
+        Suspect sensors (blocking fault_reasons) never trigger missions;
+        advisory reasons are reported but do not suppress attention.
         """
         try:
             if not data:
@@ -69,13 +105,15 @@ class AnalyticsEngine:
 
             avg_soiling = sum(data) / len(data)
             max_soiling = max(data)
+            suspect = FAULT_DETECTION_AVAILABLE and is_blocking(fault_reasons)
             
-            needs_attention = (
+            needs_attention = not suspect and (
                 avg_soiling > ATTENTION_THRESHOLD_AVG or 
                 max_soiling > ATTENTION_THRESHOLD_MAX
             )
 
             preemptive_recommended = (
+                not suspect and
                 dust_risk is not None and 
                 dust_risk > DUST_RISK_THRESHOLD
             )
@@ -86,6 +124,8 @@ class AnalyticsEngine:
                 'max_soiling': round(max_soiling, 4),
                 'needs_attention': needs_attention,
                 'preemptive_recommended': preemptive_recommended,
+                'suspect': suspect,
+                'fault_reasons': fault_reasons or [],
                 'timestamp': time.time()
             }
         
@@ -127,50 +167,93 @@ class AnalyticsEngine:
             logger.error("Scaling data forward failed: %s", str(e))
             return False
 
+    def publish_results(self, results: List[Dict]) -> bool:
+        """
+        Publish per-node results as one compact batch (JSON fallback)
+        """
+        # TODO: Implement actual API/queue integration
+        try:
+            if WIRE_FORMAT_AVAILABLE:
+                payload, content_type = encode_batch(results, kind=KIND_ANALYSIS)
+            else:
+                payload = json.dumps(results).encode("utf-8")
+                content_type = "application/json"
+            logger.info("Publishing %d results: %d bytes (%s)",
+                        len(results), len(payload), content_type)
+            return True
+        except Exception as e:
+            logger.error("Result publish failed: %s", str(e))
+            return False
+
     def run_analysis_cycle(self):
         """
         Full analysis cycle with resilience
         """
+        self.cycles += 1
+        if self.profiler is None:
+            return self._analysis_cycle()
+        with self.profiler.cycle(f"#{self.cycles}"):
+            return self._analysis_cycle()
+
+    def _analysis_cycle(self):
         dust_risk = None
         if PREDICTIVE_AVAILABLE:
             try:
-                forecast = fetch_dust_forecast()
-                dust_risk = forecast.get("dust_storm_risk")
-                logger.info("Copernicus forecast: dust risk=%.2f", dust_risk)
+                # Non-blocking: last known good forecast while CAMS is down
+                with self._stage("forecast"):
+                    forecast = safe_fetch_forecast()
+                if forecast.get("simulated"):
+                    logger.warning("No CAMS forecast available (circuit %s)",
+                                   forecast.get("breaker_state"))
+                else:
+                    dust_risk = forecast.get("dust_storm_risk")
+                    logger.info("Copernicus forecast: dust risk=%.2f", dust_risk)
             except Exception as e:
                 logger.error("Forecast fetch failed: %s", str(e))
 
         try:
-            edge_data = self.fetch_data_from_edge_nodes(num_nodes=4, batch_size=12)
+            with self._stage("fetch"):
+                edge_data = self.fetch_data_from_edge_nodes(num_nodes=4, batch_size=12)
             if not edge_data:
                 logger.warning("No data received from edge nodes")
                 return
 
-            futures = {
-                self.executor.submit(
-                    self.analyze_node_data, 
-                    node_id, 
-                    data, 
-                    dust_risk
-                ): node_id for node_id, data in edge_data.items()
-            }
+            faults = {}
+            if self.fault_detector is not None:
+                with self._stage("fault_detection"):
+                    faults = self.fault_detector.update(edge_data)
 
-            results = []
-            for future in as_completed(futures):
-                result = future.result()
-                if 'error' not in result:
-                    results.append(result)
-                    logger.debug("Processed: %s", json.dumps(result))
+            with self._stage("analysis"):
+                futures = {
+                    self.executor.submit(
+                        self.analyze_node_data, 
+                        node_id, 
+                        data, 
+                        dust_risk,
+                        faults.get(node_id)
+                    ): node_id for node_id, data in edge_data.items()
+                }
+
+                results = []
+                for future in as_completed(futures):
+                    result = future.result()
+                    if 'error' not in result:
+                        results.append(result)
+                        logger.debug("Processed: %s", result)
 
             if any(r['preemptive_recommended'] for r in results):
                 logger.warning("Preemptive actions recommended for %d nodes", 
                              len([r for r in results if r['preemptive_recommended']]))
 
-            composite_metric = sum(r['avg_soiling'] for r in results)
-            self.forward_scaling_data({"composite_metric": composite_metric})
+            with self._stage("publish"):
+                self.publish_results(results)
+
+            composite_metric = sum(r['avg_soiling'] for r in results if not r['suspect'])
+            with self._stage("scaling"):
+                self.forward_scaling_data({"composite_metric": composite_metric})
 
-            logger.info("Analysis cycle completed - Nodes: %d Metrics: %.2f", 
-                       len(results), composite_metric)
+            logger.info("Analysis cycle completed - Nodes: %d Suspect: %d Metrics: %.2f", 
+                       len(results), sum(r['suspect'] for r in results), composite_metric)
 
         except Exception as e:
             logger.critical("Analysis cycle failed: %s", str(e), exc_info=True)
@@ -183,6 +266,7 @@ def main():
                 ATTENTION_THRESHOLD_MAX)
 
     engine = AnalyticsEngine()
+    profiler = install_profiler("analytics") if PROFILING_AVAILABLE else None
     
     try:
         while True:
@@ -196,6 +280,8 @@ def main():
         logger.info("Analytics shutdown requested")
     finally:
         engine.executor.shutdown(wait=True)
+        if profiler is not None:
+            profiler.stop()
         logger.info("Analytics shutdown complete")
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+# fault_detection.py
+# Incremental sensor-fault and anomaly detection for AIr4LifeOnTheEdge analytics
+
+import os
+import logging
+from statistics import median
+from typing import Dict, List, Optional
+
+# === Configuration Setup ===
+ROBUST_Z_THRESHOLD = float(os.getenv("ROBUST_Z_THRESHOLD", "3.5"))
+MIN_SITE_PEERS = int(os.getenv("MIN_SITE_PEERS", "5"))
+FLATLINE_EPSILON = float(os.getenv("FLATLINE_EPSILON", "0.005"))
+FLATLINE_MIN_READINGS = int(os.getenv("FLATLINE_MIN_READINGS", "24"))
+STEP_THRESHOLD = float(os.getenv("STEP_THRESHOLD", "0.25"))
+BASELINE_SMOOTHING = 0.3   # EWMA weight of the newest batch median
+# Only these mean the readings themselves are unusable. A panel can really be
+# dirtier than its peers or jump after local dust, so peer_outlier and
+# step_change are reported as warnings and never suppress a cleaning.
+BLOCKING_FAULTS = frozenset(("out_of_range", "flatline"))
+MAD_FLOOR = 0.01           # Avoid exploding z-scores on very uniform sites
+
+if ROBUST_Z_THRESHOLD <= 0:
+    raise ValueError("ROBUST_Z_THRESHOLD must be positive")
+if FLATLINE_MIN_READINGS <= 1:
+    raise ValueError("FLATLINE_MIN_READINGS must be greater than 1")
+
+logger = logging.getLogger("CloudAnalytics.FaultDetection")
+
+
+def is_blocking(reasons: Optional[List[str]]) -> bool:
+    """Whether fault reasons mark a sensor's readings as unusable"""
+    return bool(reasons) and any(r in BLOCKING_FAULTS for r in reasons)
+
+
+class _NodeHistory:
+    __slots__ = ("baseline", "flat_value", "flat_run")
+
+    def __init__(self):
+        self.baseline: Optional[float] = None
+        self.flat_value: Optional[float] = None
+        self.flat_run = 0
+
+
+class FaultDetector:
+    """
+    Flags suspect sensors once per batch, fleet-wide:
+
+    - out_of_range: readings outside the 0-1 soiling scale
+    - peer_outlier: batch median far from site peers (robust z-score on MAD)
+    - flatline: the same value for FLATLINE_MIN_READINGS readings, across batches
+    - step_change: upward jump against the node's own baseline that the
+      site as a whole did not make (cleanings and site-wide dust are not faults)
+
+    Only out_of_range and flatline block triggers (see `is_blocking`); the
+    other two are advisory. Per-node state is a few scalars, so each batch
+    costs O(readings).
+    """
+
+    def __init__(self):
+        self._history: Dict[str, _NodeHistory] = {}
+
+    def update(self, batch: Dict[str, List[float]],
+               sites: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+        """Returns {node_id: [reasons]} for the suspect nodes of this batch"""
+        faults: Dict[str, List[str]] = {}
+        medians: Dict[str, float] = {}
+
+        for node_id, data in batch.items():
+            if not data:
+                continue
+            history = self._history.setdefault(node_id, _NodeHistory())
+            medians[node_id] = median(data)
+
+            if min(data) < 0.0 or max(data) > 1.0:
+                faults.setdefault(node_id, []).append("out_of_range")
+
+            if self._update_flatline(history, data) >= FLATLINE_MIN_READINGS:
+                faults.setdefault(node_id, []).append("flatline")
+
+        by_site: Dict[str, List[str]] = {}
+        for node_id in medians:
+            site = sites.get(node_id, "default") if sites else "default"
+            by_site.setdefault(site, []).append(node_id)
+
+        for nodes in by_site.values():
+            self._check_site(nodes, medians, faults)
+
+        for node_id, value in medians.items():
+            history = self._history[node_id]
+            if not is_blocking(faults.get(node_id)):
+                # Unusable readings must not drag the baseline along with them;
+                # advisory flags clear once the baseline has caught up
+                history.baseline = value if history.baseline is None else (
+                    history.baseline + BASELINE_SMOOTHING * (value - history.baseline)
+                )
+
+        if faults:
+            logger.warning("Suspect sensors: %s", ", ".join(
+                f"{n} ({'/'.join(r)})" for n, r in sorted(faults.items())
+            ))
+        return faults
+
+    @staticmethod
+    def _update_flatline(history: _NodeHistory, data: List[float]) -> int:
+        for value in data:
+            if (history.flat_value is not None
+                    and abs(value - history.flat_value) <= FLATLINE_EPSILON):
+                history.flat_run += 1
+            else:
+                history.flat_value = value
+                history.flat_run = 1
+        return history.flat_run
+
+    def _check_site(self, nodes: List[str], medians: Dict[str, float],
+                    faults: Dict[str, List[str]]) -> None:
+        values = [medians[n] for n in nodes]
+        site_median = median(values)
+
+        if len(nodes) >= MIN_SITE_PEERS:
+            mad = max(median(abs(v - site_median) for v in values), MAD_FLOOR)
+            for node_id, value in zip(nodes, values):
+                if abs(0.6745 * (value - site_median) / mad) > ROBUST_Z_THRESHOLD:
+                    faults.setdefault(node_id, []).append("peer_outlier")
+
+        shifts = [
+            medians[n] - self._history[n].baseline
+            for n in nodes if self._history[n].baseline is not None
+        ]
+        if not shifts:
+            return
+        site_shift = median(shifts)
+        for node_id in nodes:
+            baseline = self._history[node_id].baseline
+            if baseline is None:
+                continue
+            if medians[node_id] - baseline - site_shift > STEP_THRESHOLD:
+                faults.setdefault(node_id, []).append("step_change")
+
+    def forget(self, node_id: str) -> None:
+        """Drop a node's history, e.g. after a sensor replacement"""
+        self._history.pop(node_id, None)
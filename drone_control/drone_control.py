@@ -1,6 +1,11 @@
+import os
 import socket
 import time
 import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from drone_control.drone_state import state_receiver
+from drone_control.mission_batcher import DRONE_SPEED, ORIGIN
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +19,14 @@ TELLO_IP = "192.168.10.1"
 TELLO_PORT = 8889
 LOCAL_PORT = 9000
 
+# Battery limits (percent) checked against the live state stream
+MIN_TAKEOFF_BATTERY = float(os.getenv("MIN_TAKEOFF_BATTERY", "30"))
+MIN_MISSION_BATTERY = float(os.getenv("MIN_MISSION_BATTERY", "15"))
+CLEANING_DURATION = 10  # Seconds
+STATE_CHECK_INTERVAL = 0.5
+MAX_GO_CM = 500  # Tello "go" range per axis
+MIN_GO_CM = 20   # Tello rejects moves where every axis is below this
+
 # Set up UDP socket
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 sock.bind(("", LOCAL_PORT))
@@ -36,23 +49,130 @@ def send_command(command: str, delay: int = 3) -> str:
         logger.critical(f"Unexpected error: {str(e)}")
         return "critical_error"
 
-def start_mission():
-    """Executes cleaning mission sequence with robust error handling"""
-    try:
-        # Command mode
-        if send_command("command") != "ok":
-            logger.error("Failed to enter command mode")
-            return "command_mode_failure"
+def _progress_callback(on_progress: Optional[Callable[[str], None]]) -> Callable[[str], None]:
+    def progress(phase: str) -> None:
+        if on_progress is not None:
+            try:
+                on_progress(phase)
+            except Exception as e:
+                logger.error(f"Progress callback failed: {str(e)}")
+    return progress
+
+def _clean(progress: Callable[[str], None]) -> bool:
+    """Hover-clean for CLEANING_DURATION; lands and returns False on low battery"""
+    deadline = time.monotonic() + CLEANING_DURATION
+    while time.monotonic() < deadline:
+        battery = state_receiver.battery()
+        if battery is not None and battery < MIN_MISSION_BATTERY:
+            logger.warning(f"Low battery ({battery:.0f}%), aborting mission")
+            progress("aborting")
+            send_command("land", delay=5)
+            return False
+        time.sleep(min(STATE_CHECK_INTERVAL, max(deadline - time.monotonic(), 0)))
+    return True
+
+def _fly_to(here: Tuple[float, float], target: Tuple[float, float]) -> bool:
+    """Relative "go" moves in <= MAX_GO_CM legs (x forward, y left, metres in)"""
+    dx = round((target[0] - here[0]) * 100)
+    dy = round((target[1] - here[1]) * 100)
+    legs = max(1, -(-max(abs(dx), abs(dy)) // MAX_GO_CM))
+    speed = max(10, min(100, round(DRONE_SPEED * 100)))
+    for leg in range(legs):
+        step_x = dx // legs + (1 if leg < dx % legs else 0)
+        step_y = dy // legs + (1 if leg < dy % legs else 0)
+        if abs(step_x) < MIN_GO_CM and abs(step_y) < MIN_GO_CM:
+            continue
+        # Travel time plus margin before the response is read
+        delay = max(3, int(max(abs(step_x), abs(step_y)) / speed) + 2)
+        if send_command(f"go {step_x} {step_y} 0 {speed}", delay=delay) != "ok":
+            return False
+    return True
+
+def _prepare_takeoff(progress: Callable[[str], None]) -> Optional[str]:
+    """Command mode, battery check and takeoff; returns a failure result or None"""
+    state_receiver.start()
+
+    # Command mode (also enables the state stream)
+    progress("command")
+    if send_command("command") != "ok":
+        logger.error("Failed to enter command mode")
+        return "command_mode_failure"
 
-        # Takeoff (using a longer delay for a proper response)
-        if send_command("takeoff", delay=5) != "ok":
-            logger.error("Takeoff failed")
-            return "takeoff_failure"
+    battery = state_receiver.battery()
+    if battery is not None and battery < MIN_TAKEOFF_BATTERY:
+        logger.error(f"Battery too low for takeoff: {battery:.0f}%")
+        return "low_battery"
 
+    # Takeoff (using a longer delay for a proper response)
+    progress("takeoff")
+    if send_command("takeoff", delay=5) != "ok":
+        logger.error("Takeoff failed")
+        return "takeoff_failure"
+    return None
+
+def start_mission(on_progress: Optional[Callable[[str], None]] = None):
+    """
+    Executes cleaning mission sequence with robust error handling.
+    `on_progress` is called with each phase name as the mission advances.
+    """
+    progress = _progress_callback(on_progress)
+
+    try:
+        failure = _prepare_takeoff(progress)
+        if failure:
+            return failure
+
+        progress("cleaning")
         logger.info("Cleaning mission in progress...")
-        time.sleep(10)
+        if not _clean(progress):
+            return "low_battery_abort"
 
         # Landing
+        progress("landing")
+        if send_command("land", delay=5) != "ok":
+            logger.error("Landing failed")
+            return "landing_failure"
+
+        return "mission_success"
+    except Exception as e:
+        logger.critical(f"Mission sequence failed: {str(e)}")
+        return "sequence_failure"
+
+def start_route_mission(route: List[str], coords: Dict[str, Tuple[float, float]],
+                        on_progress: Optional[Callable[[str], None]] = None):
+    """
+    One takeoff/landing cycle visiting every panel of `route` in order
+    (see mission_batcher.plan_flights), then returning to the launch pad.
+    """
+    progress = _progress_callback(on_progress)
+
+    try:
+        failure = _prepare_takeoff(progress)
+        if failure:
+            return failure
+
+        here = ORIGIN
+        for panel_id in route:
+            progress(f"transit:{panel_id}")
+            if not _fly_to(here, coords[panel_id]):
+                logger.error(f"Transit to {panel_id} failed, landing in place")
+                send_command("land", delay=5)
+                return "transit_failure"
+            here = coords[panel_id]
+
+            progress(f"cleaning:{panel_id}")
+            logger.info(f"Cleaning panel {panel_id}...")
+            if not _clean(progress):
+                return "low_battery_abort"
+
+        progress("returning")
+        if not _fly_to(here, ORIGIN):
+            # Later routes assume a start at ORIGIN, so this is not a success
+            logger.error("Return to launch pad failed, landing in place")
+            send_command("land", delay=5)
+            return "return_failure"
+
+        progress("landing")
         if send_command("land", delay=5) != "ok":
             logger.error("Landing failed")
             return "landing_failure"
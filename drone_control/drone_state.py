@@ -0,0 +1,165 @@
+import os
+import time
+import socket
+import logging
+import threading
+from array import array
+from typing import Callable, Dict, List, Optional
+
+try:
+    from prometheus_client import Counter, Gauge
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("DroneState")
+
+# Tello state stream parameters
+STATE_PORT = 8890
+STATE_BUFFER_SIZE = int(os.getenv("DRONE_STATE_BUFFER", "600"))  # ~1 min at 10 Hz
+STATE_STALE_AFTER = 2.0  # Seconds without packets before state is considered lost
+
+# Fields kept in the ring buffer (Tello SDK names)
+FIELDS = ("bat", "h", "tof", "baro", "pitch", "roll", "yaw",
+          "vgx", "vgy", "vgz", "templ", "temph", "time")
+
+if METRICS_AVAILABLE:
+    DRONE_BATTERY = Gauge("drone_battery_percent", "Drone battery level")
+    DRONE_HEIGHT = Gauge("drone_height_cm", "Drone height above takeoff point")
+    DRONE_FLIGHT_TIME = Gauge("drone_flight_time_seconds", "Motor-on time of current flight")
+    DRONE_STATE_PACKETS = Counter("drone_state_packets_total", "State packets received")
+
+
+def parse_state(packet: bytes) -> Dict[str, float]:
+    """'pitch:0;roll:0;...;bat:87;...;\\r\\n' -> {'pitch': 0.0, ...}"""
+    state = {}
+    for item in packet.decode("ascii", errors="ignore").strip().split(";"):
+        key, sep, value = item.partition(":")
+        if sep and key in FIELDS:
+            try:
+                state[key] = float(value)
+            except ValueError:
+                continue
+    return state
+
+
+class StateRing:
+    """
+    Fixed-size columnar ring buffer of state samples (one float array per
+    field). `latest` is a single reference read, safe without locking.
+    """
+
+    def __init__(self, capacity: int = STATE_BUFFER_SIZE):
+        if capacity <= 0:
+            raise ValueError("DRONE_STATE_BUFFER must be positive integer")
+        self.capacity = capacity
+        self._received = array("d", bytes(8 * capacity))
+        self._columns = {f: array("f", bytes(4 * capacity)) for f in FIELDS}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.latest: Optional[Dict[str, float]] = None
+
+    def append(self, state: Dict[str, float], received_at: float) -> None:
+        with self._lock:
+            idx = self.count % self.capacity
+            self._received[idx] = received_at
+            for field, column in self._columns.items():
+                column[idx] = state.get(field, 0.0)
+            self.count += 1
+        self.latest = dict(state, received_at=received_at, seq=self.count)
+
+    def history(self, n: int) -> List[Dict[str, float]]:
+        """Up to the last `n` samples, oldest first"""
+        with self._lock:
+            n = min(n, self.count, self.capacity)
+            samples = []
+            for seq in range(self.count - n, self.count):
+                idx = seq % self.capacity
+                sample = {f: col[idx] for f, col in self._columns.items()}
+                sample["received_at"] = self._received[idx]
+                samples.append(sample)
+            return samples
+
+
+class DroneStateReceiver:
+    """Background listener for the Tello state stream (UDP 8890)"""
+
+    def __init__(self, port: int = STATE_PORT, capacity: int = STATE_BUFFER_SIZE):
+        self.port = port
+        self.ring = StateRing(capacity)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Dict[str, float]], None]] = []
+
+    def add_listener(self, callback: Callable[[Dict[str, float]], None]) -> None:
+        """Called from the receiver thread with every new state sample"""
+        self._listeners.append(callback)
+
+    def start(self) -> None:
+        """Idempotent; safe to call before every mission"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                if not self._stop.is_set():
+                    return
+                # Stopping thread exits within its 1 s socket timeout
+                self._thread.join()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="drone-state", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        """Most recent state, or None if nothing fresh has been received"""
+        state = self.ring.latest
+        if state is None or time.time() - state["received_at"] > STATE_STALE_AFTER:
+            return None
+        return state
+
+    def battery(self) -> Optional[float]:
+        state = self.latest()
+        return None if state is None else state.get("bat")
+
+    def _run(self) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(("", self.port))
+            sock.settimeout(1.0)
+        except OSError as e:
+            logger.error(f"Cannot listen for drone state on {self.port}: {str(e)}")
+            sock.close()
+            return
+
+        logger.info(f"Listening for drone state on UDP {self.port}")
+        try:
+            while not self._stop.is_set():
+                try:
+                    packet, _ = sock.recvfrom(1024)
+                except socket.timeout:
+                    continue
+                state = parse_state(packet)
+                if not state:
+                    continue
+                self.ring.append(state, time.time())
+                if METRICS_AVAILABLE:
+                    DRONE_BATTERY.set(state.get("bat", 0.0))
+                    DRONE_HEIGHT.set(state.get("h", 0.0))
+                    DRONE_FLIGHT_TIME.set(state.get("time", 0.0))
+                    DRONE_STATE_PACKETS.inc()
+                for callback in self._listeners:
+                    try:
+                        callback(self.ring.latest)
+                    except Exception as e:
+                        logger.error(f"State listener failed: {str(e)}")
+        except Exception as e:
+            logger.critical(f"Drone state receiver failed: {str(e)}")
+        finally:
+            sock.close()
+
+
+state_receiver = DroneStateReceiver()
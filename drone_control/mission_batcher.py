@@ -0,0 +1,126 @@
+import os
+import json
+import math
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("MissionBatcher")
+
+Point = Tuple[float, float]
+
+# Route planning parameters
+PANEL_LAYOUT = os.getenv("PANEL_LAYOUT", "panels.json")           # {panel_id: [x_m, y_m]}
+MISSION_BATCH_WINDOW = float(os.getenv("MISSION_BATCH_WINDOW", "30"))  # Seconds
+DRONE_SPEED = float(os.getenv("DRONE_SPEED", "0.8"))              # m/s (Tello max 1.0)
+MAX_FLIGHT_SECONDS = float(os.getenv("MAX_FLIGHT_SECONDS", "600"))
+SECONDS_PER_BATTERY_PERCENT = float(os.getenv("SECONDS_PER_BATTERY_PERCENT", "7"))
+TAKEOFF_LAND_SECONDS = 15.0
+STOP_SECONDS = 12.0  # Cleaning plus settle time per panel
+ORIGIN: Point = (0.0, 0.0)  # Launch pad
+
+if DRONE_SPEED <= 0:
+    raise ValueError("DRONE_SPEED must be positive")
+
+
+def load_layout(path: str = PANEL_LAYOUT) -> Dict[str, Point]:
+    """Panel coordinates in metres relative to the launch pad"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {pid: (float(x), float(y)) for pid, (x, y) in json.load(f).items()}
+    except FileNotFoundError:
+        logger.warning(f"Panel layout {path} not found; multi-stop routing disabled")
+        return {}
+
+
+def _dist(a: Point, b: Point) -> float:
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def tour_length(route: Sequence[str], coords: Dict[str, Point],
+                origin: Point = ORIGIN) -> float:
+    """Closed tour length: origin -> stops in order -> origin"""
+    points = [origin] + [coords[p] for p in route] + [origin]
+    return sum(_dist(a, b) for a, b in zip(points, points[1:]))
+
+
+def flight_seconds(route: Sequence[str], coords: Dict[str, Point],
+                   origin: Point = ORIGIN) -> float:
+    return (TAKEOFF_LAND_SECONDS + STOP_SECONDS * len(route)
+            + tour_length(route, coords, origin) / DRONE_SPEED)
+
+
+def nearest_neighbor(panels: Sequence[str], coords: Dict[str, Point],
+                     origin: Point = ORIGIN) -> List[str]:
+    remaining = set(panels)
+    route, here = [], origin
+    while remaining:
+        # Sort key includes the id so ties resolve deterministically
+        nxt = min(remaining, key=lambda p: (_dist(here, coords[p]), p))
+        route.append(nxt)
+        remaining.discard(nxt)
+        here = coords[nxt]
+    return route
+
+
+def two_opt(route: List[str], coords: Dict[str, Point],
+            origin: Point = ORIGIN) -> List[str]:
+    """Reverse segments while that shortens the closed tour"""
+    points = [origin] + [coords[p] for p in route] + [origin]
+    order = list(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(points) - 2):
+            for j in range(i + 1, len(points) - 1):
+                delta = (_dist(points[i - 1], points[j]) + _dist(points[i], points[j + 1])
+                         - _dist(points[i - 1], points[i]) - _dist(points[j], points[j + 1]))
+                if delta < -1e-9:
+                    points[i:j + 1] = reversed(points[i:j + 1])
+                    order[i - 1:j] = reversed(order[i - 1:j])
+                    improved = True
+    return order
+
+
+def plan_route(panels: Sequence[str], coords: Dict[str, Point],
+               origin: Point = ORIGIN) -> List[str]:
+    """Visiting order for one batch: nearest-neighbour seed, 2-opt refinement"""
+    route = nearest_neighbor(sorted(set(panels)), coords, origin)
+    return two_opt(route, coords, origin) if len(route) > 2 else route
+
+
+def flight_budget(battery: Optional[float], min_battery: float) -> float:
+    """Usable flight seconds for the live battery level (or the static maximum)"""
+    if battery is None:
+        return MAX_FLIGHT_SECONDS
+    return min(MAX_FLIGHT_SECONDS, max(battery - min_battery, 0.0) * SECONDS_PER_BATTERY_PERCENT)
+
+
+def split_flights(route: Sequence[str], coords: Dict[str, Point], budget: float,
+                  origin: Point = ORIGIN) -> List[List[str]]:
+    """
+    Cut the route into consecutive flights that each fit the budget,
+    returning to the pad between them. A single stop always gets a flight.
+    """
+    flights: List[List[str]] = []
+    current: List[str] = []
+    for panel in route:
+        if current and flight_seconds(current + [panel], coords, origin) > budget:
+            flights.append(current)
+            current = []
+        current.append(panel)
+    if current:
+        flights.append(current)
+    return flights
+
+
+def plan_flights(panels: Sequence[str], coords: Dict[str, Point], budget: float,
+                 origin: Point = ORIGIN) -> List[List[str]]:
+    """Route a batch of targets and split it into battery-feasible flights"""
+    unknown = [p for p in panels if p not in coords]
+    if unknown:
+        raise ValueError(f"Panels missing from layout: {', '.join(sorted(unknown))}")
+    flights = split_flights(plan_route(panels, coords, origin), coords, budget, origin)
+    for flight in flights:
+        route = plan_route(flight, coords, origin)
+        flight[:] = route
+    return flights
@@ -1,4 +1,15 @@
 #!/bin/bash
+# SERVER_MODE=asgi serves the async command server (one event-loop worker)
+if [ "${SERVER_MODE}" = "asgi" ]; then
+    exec gunicorn \
+        --bind 0.0.0.0:5000 \
+        --workers ${ASGI_WORKERS:-1} \
+        --worker-class uvicorn.workers.UvicornWorker \
+        --timeout ${GUNICORN_TIMEOUT} \
+        --log-level ${GUNICORN_LOG_LEVEL} \
+        server.edge_command_server_asgi:app
+fi
+
 exec gunicorn \
     --bind 0.0.0.0:5000 \
     --workers ${GUNICORN_WORKERS} \
@@ -3,28 +3,52 @@
 # Rev 3.0 - Incorporates thread-safe operations, proper signal handling, and resilience patterns
 
 import os
+import json
 import time
 import logging
 import random
 import signal
 import sched
 import threading
+from collections import deque
+from contextlib import nullcontext
 from logging.handlers import RotatingFileHandler
 from typing import NoReturn
 from tenacity import retry, wait_exponential, stop_after_attempt  # [16]
 
 # === Predictive Maintenance Integration ===
 try:
-    from predictive_maintenance.predictive_trigger import should_trigger_preemptive_cleaning
+    from predictive_maintenance.predictive_trigger import (
+        plan_preemptive_cleaning,
+        planner as cleaning_planner
+    )
     PREDICTIVE_AVAILABLE = True
 except ImportError as e:
     logging.warning("Predictive module unavailable: %s", str(e))
     PREDICTIVE_AVAILABLE = False
 
+# === Telemetry Wire Format ===
+try:
+    from telemetry.wire_format import encode as encode_batch
+    WIRE_FORMAT_AVAILABLE = True
+except ImportError as e:
+    logging.warning("Binary wire format unavailable, using JSON: %s", str(e))
+    WIRE_FORMAT_AVAILABLE = False
+
+# === Profiling Instrumentation ===
+try:
+    from instrumentation.profiling import CycleProfiler, install_profiler
+    PROFILING_AVAILABLE = True
+except ImportError as e:
+    logging.warning("Profiling instrumentation unavailable: %s", str(e))
+    PROFILING_AVAILABLE = False
+
 # --- ENVIRONMENT CONFIGURATION ---
 SENSOR_POLL_INTERVAL = int(os.getenv("SENSOR_POLL_INTERVAL", "10"))
 SOILING_THRESHOLD = float(os.getenv("SOILING_THRESHOLD", "0.7"))
 CLOUD_REPORT_FREQ = int(os.getenv("CLOUD_REPORT_FREQ", "5"))
+NODE_ID = os.getenv("NODE_ID", "node_1")
+REPORT_BUFFER_MAX = int(os.getenv("REPORT_BUFFER_MAX", "8640"))  # ~1 day of readings at 10 s
 
 # --- CONFIGURATION VALIDATION --- [12][16]
 if not 0 <= SOILING_THRESHOLD <= 1:
@@ -106,45 +130,100 @@ class DroneController:
 
 # --- CLOUD INTEGRATION LAYER ---
 class CloudReporter:
-    @staticmethod
-    def send_report(value: float) -> None:
-        """Submit telemetry with network resilience"""
+    # Oldest readings are dropped first while the cloud is unreachable
+    _buffer = deque(maxlen=REPORT_BUFFER_MAX)
+
+    @classmethod
+    def record(cls, value: float) -> None:
+        """Buffer a reading for the next batched report"""
+        cls._buffer.append((NODE_ID, time.time(), value))
+
+    @classmethod
+    def send_report(cls) -> None:
+        """Submit buffered telemetry as one batch with network resilience"""
+        if not cls._buffer:
+            return
+        try:
+            if WIRE_FORMAT_AVAILABLE:
+                payload, content_type = encode_batch(list(cls._buffer))
+            else:
+                payload = json.dumps([
+                    {"node_id": n, "timestamp": t, "soiling": v}
+                    for n, t, v in cls._buffer
+                ]).encode("utf-8")
+                content_type = "application/json"
+        except ValueError as e:
+            # Unencodable readings would fail every later report too
+            logging.error("Dropping %d unencodable readings: %s", len(cls._buffer), str(e))
+            cls._buffer.clear()
+            return
         try:
             # TODO: Implement secure cloud communication
-            logging.info("Cloud report submitted: %.2f", value)
+            logging.info("Cloud report submitted: %d readings, %d bytes (%s)",
+                         len(cls._buffer), len(payload), content_type)
+            cls._buffer.clear()
         except Exception as e:
             logging.error("Cloud report failed: %s", str(e))
 
-# --- CORE OPERATIONS ---
-def main_loop(scheduler: sched.scheduler, cycle: int = 0) -> None:
-    """Orchestration loop with failure containment"""
-    if ShutdownManager._shutdown_event.is_set():
-        logging.info("Terminating scheduler")
-        return
+# --- INSTRUMENTATION ---
+cycle_profiler = (
+    CycleProfiler("edge", budget=SENSOR_POLL_INTERVAL)
+    if PROFILING_AVAILABLE else None
+)
 
-    try:
-        # Sensor read with hardware resilience
+def _stage(name: str):
+    return cycle_profiler.stage(name) if cycle_profiler else nullcontext()
+
+# --- CORE OPERATIONS ---
+def _run_cycle(cycle: int) -> None:
+    """One sensor read, trigger decision and report"""
+    # Sensor read with hardware resilience
+    with _stage("sensor_read"):
         soiling_level = SensorInterface.read()
-        logging.info("Cycle %d - Soiling: %.2f", cycle, soiling_level)
+    logging.info("Cycle %d - Soiling: %.2f", cycle, soiling_level)
 
-        # Reactive cleaning trigger
-        if soiling_level >= SOILING_THRESHOLD:
-            logging.warning("Cycle %d - Threshold exceeded!", cycle)
-            DroneController.trigger_cleaning("soiling")
+    # Reactive cleaning trigger, used as is when the planner is unavailable
+    reason = "soiling" if soiling_level >= SOILING_THRESHOLD else None
 
-        # Predictive maintenance [5][16]
-        if PREDICTIVE_AVAILABLE:
+    # Predictive maintenance [5][16]
+    # The planner may defer a threshold crossing until a forecast dust
+    # event has passed; the decision rule is shared with the fleet simulator.
+    if PREDICTIVE_AVAILABLE:
+        with _stage("predictive"):
             try:
-                if should_trigger_preemptive_cleaning():
-                    logging.warning("Cycle %d - Preemptive trigger", cycle)
-                    DroneController.trigger_cleaning("predictive")
+                reason = plan_preemptive_cleaning(NODE_ID, soiling_level)
             except Exception as e:
                 logging.error("Cycle %d - Predictive failure: %s", cycle, str(e))
 
-        # Cloud reporting
+    with _stage("drone_trigger"):
+        if reason == "predictive":
+            logging.warning("Cycle %d - Planned cleaning due", cycle)
+        elif reason:
+            logging.warning("Cycle %d - Threshold exceeded!", cycle)
+        if reason:
+            DroneController.trigger_cleaning(reason)
+            # Either way the planner must not read the drop as a soiling trend
+            if PREDICTIVE_AVAILABLE:
+                cleaning_planner.mark_cleaned(NODE_ID)
+
+    # Cloud reporting
+    with _stage("report"):
+        CloudReporter.record(soiling_level)
         if cycle % CLOUD_REPORT_FREQ == 0:
-            CloudReporter.send_report(soiling_level)
+            CloudReporter.send_report()
+
+def main_loop(scheduler: sched.scheduler, cycle: int = 0) -> None:
+    """Orchestration loop with failure containment"""
+    if ShutdownManager._shutdown_event.is_set():
+        logging.info("Terminating scheduler")
+        return
 
+    try:
+        if cycle_profiler is None:
+            _run_cycle(cycle)
+        else:
+            with cycle_profiler.cycle(f"#{cycle}"):
+                _run_cycle(cycle)
     finally:
         scheduler.enter(
             SENSOR_POLL_INTERVAL,
@@ -160,6 +239,7 @@ def main() -> NoReturn:
     
     # System initialization
     ShutdownManager.initialize()
+    profiler = install_profiler("edge") if PROFILING_AVAILABLE else None
     
     # Scheduler configuration [2][9]
     scheduler = sched.scheduler(time.monotonic, time.sleep)
@@ -170,6 +250,8 @@ def main() -> NoReturn:
     except KeyboardInterrupt:
         logging.info("Operator-initiated shutdown")
     finally:
+        if profiler is not None:
+            profiler.stop()
         logging.info("Node shutdown complete")
 
 if __name__ == "__main__":
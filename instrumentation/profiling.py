@@ -0,0 +1,200 @@
+# instrumentation/profiling.py
+# Per-cycle stage timing, slow-cycle detection and an opt-in sampling
+# profiler (collapsed stacks for flamegraphs) for the edge and cloud loops
+
+import os
+import sys
+import time
+import signal
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from prometheus_client import Histogram
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+# --- CONFIGURATION ---
+PROFILE_SAMPLING = os.getenv("PROFILE_SAMPLING", "false").lower() == "true"
+PROFILE_HZ = float(os.getenv("PROFILE_HZ", "49"))        # Off-beat rate avoids lockstep with timers
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_DEPTH = 64
+
+if PROFILE_HZ <= 0:
+    raise ValueError("PROFILE_HZ must be positive")
+
+logger = logging.getLogger("Profiling")
+
+if METRICS_AVAILABLE:
+    STAGE_SECONDS = Histogram(
+        "cycle_stage_seconds",
+        "Time spent per loop stage",
+        ["loop", "stage"],
+        buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60)
+    )
+
+
+class CycleProfiler:
+    """
+    Times named stages of one loop cycle. A cycle that runs longer than
+    `budget` seconds is logged with its full stage breakdown; otherwise the
+    breakdown only goes to DEBUG. Overhead is two perf_counter calls per stage.
+    """
+
+    def __init__(self, loop: str, budget: float,
+                 log: Optional[logging.Logger] = None):
+        self.loop = loop
+        self.budget = budget
+        self.log = log or logger
+        self.last_breakdown: List[Tuple[str, float]] = []
+        self.last_total = 0.0
+        self._stages: Optional[List[Tuple[str, float]]] = None
+
+    @contextmanager
+    def cycle(self, label: str = ""):
+        self._stages = []
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            total = time.perf_counter() - start
+            stages, self._stages = self._stages, None
+            timed = sum(duration for _, duration in stages)
+            if total - timed > 0.0005:
+                stages.append(("other", total - timed))
+            self.last_breakdown, self.last_total = stages, total
+            self._report(label, total, stages)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            if self._stages is not None:
+                self._stages.append((name, duration))
+            if METRICS_AVAILABLE:
+                STAGE_SECONDS.labels(loop=self.loop, stage=name).observe(duration)
+
+    def _report(self, label: str, total: float,
+                stages: List[Tuple[str, float]]) -> None:
+        breakdown = " ".join(f"{name}={duration * 1000:.1f}ms" for name, duration in stages)
+        if total > self.budget:
+            self.log.warning("%s cycle %s overran %.1fs budget: %.3fs | %s",
+                           self.loop, label, self.budget, total, breakdown)
+        elif self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("%s cycle %s: %.3fs | %s", self.loop, label, total, breakdown)
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads PROFILE_HZ times per second and writes
+    collapsed stacks ("thread;frame;frame count") for flamegraph.pl/speedscope.
+    Costs nothing until started.
+    """
+
+    def __init__(self, name: str, hz: float = PROFILE_HZ, out_dir: str = PROFILE_DIR):
+        self.name = name
+        self.interval = 1.0 / hz
+        self.out_dir = out_dir
+        self._samples: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._started_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._samples = Counter()
+            self._stop.clear()
+            self._started_at = time.time()
+            self._thread = threading.Thread(
+                target=self._run, name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+        logger.info("Sampling profiler started for %s at %.0f Hz",
+                    self.name, 1.0 / self.interval)
+
+    def stop(self) -> Optional[str]:
+        """Stops sampling and returns the written file path"""
+        with self._lock:
+            if not self.running:
+                return None
+            self._stop.set()
+            thread = self._thread
+        thread.join()
+        return self.dump()
+
+    def toggle(self) -> None:
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def dump(self) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(
+            self.out_dir,
+            f"{self.name}-{os.getpid()}-{int(self._started_at)}.collapsed"
+        )
+        samples = self._samples
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        logger.info("Wrote %d samples (%d stacks) to %s",
+                    sum(samples.values()), len(samples), path)
+        return path
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names: Dict[int, str] = {}
+        next_sample = time.perf_counter()
+        while not self._stop.is_set():
+            frames = sys._current_frames()
+            if len(names) != len(frames):
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < PROFILE_MAX_DEPTH:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name}@{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+                    )
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self._samples[";".join(reversed(stack))] += 1
+            del frames
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_sample = time.perf_counter()
+
+
+def install_profiler(name: str, signum: int = signal.SIGUSR1) -> SamplingProfiler:
+    """
+    Creates the process profiler; `kill -USR1 <pid>` toggles it and each stop
+    writes a collapsed-stack file. PROFILE_SAMPLING=true starts it at boot.
+    Must be called from the main thread.
+    """
+    profiler = SamplingProfiler(name)
+    signal.signal(signum, lambda *_: threading.Thread(
+        target=profiler.toggle, name="profiler-toggle", daemon=True
+    ).start())
+    if PROFILE_SAMPLING:
+        profiler.start()
+    return profiler
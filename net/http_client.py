@@ -0,0 +1,233 @@
+# net/http_client.py
+# Shared outbound HTTP client: pooled keep-alive sessions, optional HTTP/2,
+# per-host timeouts, centralized retry policies and circuit breakers
+
+import os
+import logging
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+from net.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+try:
+    import httpx
+    import h2  # noqa: F401 - httpx needs it for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# --- CONFIGURATION ---
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))   # Hosts kept per session
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "8"))           # Keep-alive sockets per host
+HTTP_BREAKER_FAILURES = int(os.getenv("HTTP_BREAKER_FAILURES", "5"))
+HTTP_BREAKER_RESET = float(os.getenv("HTTP_BREAKER_RESET", "30"))      # Seconds
+
+if HTTP_POOL_MAXSIZE <= 0:
+    raise ValueError("HTTP_POOL_MAXSIZE must be positive integer")
+
+logger = logging.getLogger("HttpClient")
+
+
+class HttpStatusError(Exception):
+    """Non-2xx response; carries the status code and response body"""
+
+    def __init__(self, status_code: int, url: str, body: str = ""):
+        super().__init__(f"HTTP {status_code} from {url}")
+        self.status_code = status_code
+        self.url = url
+        self.body = body
+
+
+class TransportError(Exception):
+    """Connection, TLS or timeout failure before a response was received"""
+
+
+class HostPolicy(NamedTuple):
+    connect_timeout: float = 5.0
+    read_timeout: float = 10.0
+    attempts: int = 3
+    backoff_min: float = 1.0
+    backoff_max: float = 10.0
+    retry_statuses: Tuple[int, ...] = (429, 502, 503, 504)
+    pool_maxsize: int = HTTP_POOL_MAXSIZE
+    breaker_failures: int = HTTP_BREAKER_FAILURES
+    breaker_reset: float = HTTP_BREAKER_RESET
+
+
+DEFAULT_POLICY = HostPolicy()
+
+
+class HttpClient:
+    """
+    One pooled session per host, reused across calls so keep-alive
+    connections (and their TLS handshakes) survive between requests.
+    """
+
+    def __init__(self, http2: bool = HTTP2_ENABLED):
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._policies: Dict[str, HostPolicy] = {}
+        self._sessions: Dict[str, object] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    # --- CONFIGURATION ---
+    def register_policy(self, host: str, policy: HostPolicy) -> None:
+        with self._lock:
+            self._policies[host] = policy
+            self._breakers.pop(host, None)
+
+    def policy(self, host: str) -> HostPolicy:
+        return self._policies.get(host, DEFAULT_POLICY)
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                policy = self.policy(host)
+                breaker = CircuitBreaker(
+                    host,
+                    failure_threshold=policy.breaker_failures,
+                    reset_timeout=policy.breaker_reset
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def breaker_states(self) -> Dict[str, str]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.name: b.state for b in breakers}
+
+    # --- SESSIONS ---
+    def _session(self, scheme: str, host: str):
+        key = f"{scheme}://{host}"
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                return session
+            policy = self.policy(host)
+            if self.http2 and scheme == "https":
+                session = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=policy.pool_maxsize,
+                        max_keepalive_connections=policy.pool_maxsize
+                    )
+                )
+            else:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=policy.pool_maxsize,
+                    max_retries=0  # Retries are handled by request()
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+            self._sessions[key] = session
+            return session
+
+    def _send(self, session, method: str, url: str, policy: HostPolicy, **kwargs):
+        if isinstance(session, requests.Session):
+            try:
+                response = session.request(
+                    method, url,
+                    timeout=(policy.connect_timeout, policy.read_timeout),
+                    **kwargs
+                )
+            except requests.RequestException as e:
+                raise TransportError(str(e)) from e
+        else:
+            try:
+                response = session.request(
+                    method, url,
+                    timeout=httpx.Timeout(policy.read_timeout,
+                                          connect=policy.connect_timeout),
+                    **kwargs
+                )
+            except httpx.RequestError as e:
+                raise TransportError(str(e)) from e
+
+        if response.status_code >= 400:
+            raise HttpStatusError(response.status_code, url, response.text[:200])
+        return response
+
+    # --- REQUESTS ---
+    def request(self, method: str, url: str,
+                policy: Optional[HostPolicy] = None, **kwargs):
+        """
+        Send a request with the host's retry policy and circuit breaker.
+        Raises CircuitOpenError without touching the network while the
+        host's circuit is open, HttpStatusError or TransportError otherwise.
+        """
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        policy = policy or self.policy(host)
+        breaker = self.breaker(host)
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit {host} is open")
+
+        def retryable(e: BaseException) -> bool:
+            if isinstance(e, HttpStatusError):
+                return e.status_code in policy.retry_statuses
+            return isinstance(e, TransportError)
+
+        retrying = Retrying(
+            wait=wait_exponential(multiplier=1, min=policy.backoff_min,
+                                  max=policy.backoff_max),
+            stop=stop_after_attempt(policy.attempts),
+            retry=retry_if_exception(retryable),
+            before_sleep=lambda state: logger.warning(
+                "Retrying %s %s (attempt %d)", method, host, state.attempt_number
+            ),
+            reraise=True
+        )
+        try:
+            session = self._session(parts.scheme, host)
+            response = retrying(self._send, session, method, url, policy, **kwargs)
+        except HttpStatusError as e:
+            # A 4xx means the host is up; only server-side failures trip the breaker
+            if e.status_code >= 500 or e.status_code in policy.retry_statuses:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except Exception:
+            # TransportError and anything unexpected: never leave a
+            # half-open probe in flight
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return response
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Process-wide shared client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+                logger.info("Outbound HTTP client ready | HTTP/2: %s", _client.http2)
+    return _client
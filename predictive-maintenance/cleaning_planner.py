@@ -0,0 +1,233 @@
+# cleaning_planner.py
+# Forecast-aware fleet cleaning planner for AIr4LifeOnTheEdge
+
+import os
+import time
+import logging
+from typing import Dict, List, Optional, Sequence
+
+# --- CONSTANTS ---
+SLOT_SECONDS = 3600  # CAMS forecast steps are hourly
+SOILING_THRESHOLD = float(os.getenv("SOILING_THRESHOLD", "0.7"))
+DUST_SOILING_RATE = float(os.getenv("DUST_SOILING_RATE", "0.05"))      # Soiling/hour at risk 1.0
+MAX_MISSIONS_PER_SLOT = int(os.getenv("MAX_MISSIONS_PER_SLOT", "2"))    # Drone capacity per hour
+MAX_DEFER_HOURS = int(os.getenv("MAX_DEFER_HOURS", "12"))              # Max wait after threshold crossing
+TREND_SMOOTHING = 0.3                                                 # EWMA weight for new trend samples
+TREND_MIN_SPAN = SLOT_SECONDS                                         # Min seconds between trend samples
+
+if MAX_MISSIONS_PER_SLOT <= 0:
+    raise ValueError("MAX_MISSIONS_PER_SLOT must be positive integer")
+
+logger = logging.getLogger("Cleaning Planner")
+
+
+class NodeState:
+    __slots__ = ("level", "trend", "updated_at", "anchor_level", "anchor_at", "over_since")
+
+    def __init__(self, level: float, trend: float, updated_at: float):
+        self.level = level
+        self.trend = trend
+        self.updated_at = updated_at
+        # Trend samples span at least TREND_MIN_SPAN so sensor noise is not
+        # amplified by the poll interval
+        self.anchor_level = level
+        self.anchor_at: Optional[float] = updated_at
+        self.over_since: Optional[float] = None
+
+
+class CleaningPlanner:
+    """
+    Precomputed fleet cleaning schedule over the forecast horizon.
+
+    Each node gets at most one cleaning slot per horizon. The slot is the one
+    that removes the most soiling-hours: cleaning at hour t saves
+    (horizon - t) * level(t), so a node is cleaned right after a predicted dust
+    event instead of just before it. Forecast updates replan the whole fleet,
+    node observations only replan that node. `is_due` is a dict lookup.
+
+    The planner only answers for hours covered by the loaded forecast; outside
+    them (no forecast, or past its horizon) `is_due` returns None and callers
+    fall back to the reactive threshold.
+    """
+
+    def __init__(self, threshold: float = SOILING_THRESHOLD,
+                 capacity: int = MAX_MISSIONS_PER_SLOT):
+        self.threshold = threshold
+        self.capacity = capacity
+        self._risks: List[float] = []
+        self._start_slot = int(time.time() // SLOT_SECONDS)
+        self._nodes: Dict[str, NodeState] = {}
+        self._plan: Dict[str, int] = {}            # node_id -> absolute slot
+        self._slots: Dict[int, set] = {}           # absolute slot -> node_ids
+
+    # --- INPUTS ---
+    def update_forecast(self, risks: Sequence[float],
+                        now: Optional[float] = None) -> None:
+        """Load a new hourly risk series (index 0 = current hour) and replan"""
+        now = time.time() if now is None else now
+        self._risks = [min(max(float(r), 0.0), 1.0) for r in risks]
+        self._start_slot = int(now // SLOT_SECONDS)
+        self._replan_all()
+
+    def observe(self, node_id: str, level: float,
+                now: Optional[float] = None) -> None:
+        """Record a soiling reading, refresh the node trend and replan it"""
+        now = time.time() if now is None else now
+        state = self._nodes.get(node_id)
+        if state is None:
+            state = self._nodes[node_id] = NodeState(level, 0.0, now)
+        elif state.anchor_at is None:
+            # First reading after a cleaning anchors the new trend
+            state.anchor_level = level
+            state.anchor_at = now
+            state.level = level
+            state.updated_at = now
+        else:
+            span = now - state.anchor_at
+            if span >= TREND_MIN_SPAN:
+                sample = (level - state.anchor_level) * SLOT_SECONDS / span
+                state.trend += TREND_SMOOTHING * (sample - state.trend)
+                state.anchor_level = level
+                state.anchor_at = now
+            state.level = level
+            state.updated_at = now
+
+        if level < self.threshold:
+            state.over_since = None
+        elif state.over_since is None:
+            state.over_since = now
+        self._replan_node(node_id)
+
+    def update_node(self, node_id: str, level: float, trend: float,
+                    now: Optional[float] = None) -> None:
+        """Set a node's level and soiling trend (per hour) directly and replan it"""
+        now = time.time() if now is None else now
+        self._nodes[node_id] = NodeState(level, trend, now)
+        self._replan_node(node_id)
+
+    def mark_cleaned(self, node_id: str, now: Optional[float] = None) -> None:
+        """Reset a node after its cleaning mission"""
+        now = time.time() if now is None else now
+        state = self._nodes.get(node_id)
+        trend = state.trend if state else 0.0
+        cleaned = self._nodes[node_id] = NodeState(0.0, trend, now)
+        # The post-cleaning level is unknown until the next reading
+        cleaned.anchor_at = None
+        self._replan_node(node_id)
+
+    # --- QUERIES ---
+    def covers(self, now: Optional[float] = None) -> bool:
+        """Whether the loaded forecast covers the current hour"""
+        now = time.time() if now is None else now
+        return 0 <= int(now // SLOT_SECONDS) - self._start_slot < len(self._risks)
+
+    def is_due(self, node_id: str, now: Optional[float] = None) -> Optional[bool]:
+        """
+        O(1) check whether a node's planned cleaning slot has arrived.
+        None means the planner cannot decide (no forecast for this hour, or
+        no drone capacity for a node over the threshold). A node held over
+        the threshold for MAX_DEFER_HOURS is due regardless of the plan.
+        """
+        now = time.time() if now is None else now
+        if not self.covers(now):
+            return None
+        state = self._nodes.get(node_id)
+        if (state is not None and state.over_since is not None
+                and now - state.over_since >= MAX_DEFER_HOURS * SLOT_SECONDS):
+            return True
+        slot = self._plan.get(node_id)
+        if slot is None:
+            return None if state is not None and state.level >= self.threshold else False
+        return slot <= int(now // SLOT_SECONDS)
+
+    def decide(self, node_id: str, level: float,
+               now: Optional[float] = None) -> Optional[str]:
+        """
+        The cleaning trigger rule shared by the edge loop and the fleet
+        simulator: records the reading, then returns "predictive" when the
+        planned slot has arrived, "soiling" when the planner cannot decide
+        and the reading is over the threshold, otherwise None.
+        """
+        self.observe(node_id, level, now)
+        due = self.is_due(node_id, now)
+        if due:
+            return "predictive"
+        if due is None and level >= self.threshold:
+            return "soiling"
+        return None
+
+    def next_cleaning(self, node_id: str) -> Optional[float]:
+        """Epoch time of the node's planned cleaning, or None"""
+        slot = self._plan.get(node_id)
+        return None if slot is None else float(slot * SLOT_SECONDS)
+
+    def schedule(self) -> Dict[float, List[str]]:
+        """Planned cleanings grouped by slot start time"""
+        return {
+            float(slot * SLOT_SECONDS): sorted(nodes)
+            for slot, nodes in sorted(self._slots.items()) if nodes
+        }
+
+    # --- PLANNING ---
+    def _horizon(self) -> int:
+        return max(len(self._risks), 1)
+
+    def _candidates(self, node_id: str) -> List[int]:
+        """Slot offsets ranked by soiling-hours saved, best first"""
+        state = self._nodes[node_id]
+        horizon = self._horizon()
+        offset = int(state.updated_at // SLOT_SECONDS) - self._start_slot
+
+        level = state.level
+        levels = []
+        for h in range(horizon):
+            if h > offset:
+                risk = self._risks[h] if h < len(self._risks) else 0.0
+                level = min(level + state.trend + DUST_SOILING_RATE * risk, 1.0)
+            levels.append(level)
+
+        first = max(offset, 0)
+        crossing = next(
+            (h for h in range(first, horizon) if levels[h] >= self.threshold),
+            None
+        )
+        if crossing is None:
+            return []
+
+        last = min(crossing + MAX_DEFER_HOURS, horizon - 1)
+        window = range(crossing, last + 1)
+        return sorted(window, key=lambda h: (-(horizon - h) * levels[h], h))
+
+    def _place(self, node_id: str, ranked: List[int]) -> None:
+        for h in ranked:
+            slot = self._start_slot + h
+            nodes = self._slots.setdefault(slot, set())
+            if len(nodes) < self.capacity:
+                nodes.add(node_id)
+                self._plan[node_id] = slot
+                return
+        if ranked:
+            logger.warning("No drone capacity left for %s within horizon", node_id)
+
+    def _release(self, node_id: str) -> None:
+        slot = self._plan.pop(node_id, None)
+        if slot is not None:
+            self._slots.get(slot, set()).discard(node_id)
+
+    def _replan_node(self, node_id: str) -> None:
+        self._release(node_id)
+        self._place(node_id, self._candidates(node_id))
+
+    def _replan_all(self) -> None:
+        self._plan.clear()
+        self._slots.clear()
+        ranked = {node_id: self._candidates(node_id) for node_id in self._nodes}
+        # Most urgent nodes (earliest threshold crossing) get first pick of capacity
+        order = sorted(
+            (n for n, r in ranked.items() if r),
+            key=lambda n: min(ranked[n])
+        )
+        for node_id in order:
+            self._place(node_id, ranked[node_id])
+        logger.info("Cleaning plan rebuilt: %d of %d nodes scheduled",
+                    len(self._plan), len(self._nodes))
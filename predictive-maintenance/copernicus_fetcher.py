@@ -2,17 +2,42 @@
 # Production-Ready CAMS Data Fetcher for AIr4LifeOnTheEdge
 
 import os
+import sys
+import time
+import random
 import logging
+import threading
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
 
-import requests
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
+# Shared net/ package lives at the repository root; keep the documented
+# `python predictive-maintenance/predictive_trigger.py` entry point working
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from net.circuit_breaker import CircuitBreaker  # noqa: E402
+from net.http_client import HostPolicy, HttpStatusError, get_client  # noqa: E402
+
+try:
+    from prometheus_client import Counter, Gauge
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
 
 # --- CONSTANTS ---
 CAMS_API_URL = "https://api.ceda.ac.uk/cams-global-reanalysis"
 DAOD_NORMALIZATION_FACTOR = 3.0  # Based on CAMS DAOD scale [0-3]
 COMPENSATION_FACTOR = 1.25       # Compensate for CAMS underestimation [14]
+FORECAST_HORIZON_HOURS = int(os.getenv("FORECAST_HORIZON_HOURS", "24"))
+FORECAST_MAX_AGE = int(os.getenv("FORECAST_MAX_AGE", "3600"))          # Seconds before refresh
+FORECAST_STALE_AFTER = int(os.getenv(                                  # Seconds before discard
+    "FORECAST_STALE_AFTER", str(FORECAST_HORIZON_HOURS * 3600)
+))
+FORECAST_RETRY_DELAY = float(os.getenv("FORECAST_RETRY_DELAY", "60"))  # Seconds after a failed refresh
+CAMS_BREAKER_FAILURES = int(os.getenv("CAMS_BREAKER_FAILURES", "3"))
+CAMS_BREAKER_RESET = float(os.getenv("CAMS_BREAKER_RESET", "300"))     # Seconds
 
 # --- LOGGING ---
 logging.basicConfig(
@@ -21,6 +46,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger("CAMS Fetcher")
 
+# --- HTTP POLICY ---
+get_client().register_policy(
+    urlsplit(CAMS_API_URL).hostname,
+    HostPolicy(connect_timeout=5, read_timeout=15, attempts=3,
+               backoff_min=2, backoff_max=30)
+)
+
+# --- CIRCUIT BREAKER ---
+# Wraps the whole fetch (HTTP and parsing) so malformed responses count too
+cams_breaker = CircuitBreaker(
+    "cams",
+    failure_threshold=CAMS_BREAKER_FAILURES,
+    reset_timeout=CAMS_BREAKER_RESET
+)
+BREAKER_STATE_VALUES = {
+    CircuitBreaker.CLOSED: 0,
+    CircuitBreaker.HALF_OPEN: 1,
+    CircuitBreaker.OPEN: 2
+}
+
+if METRICS_AVAILABLE:
+    CAMS_BREAKER_STATE = Gauge(
+        "cams_circuit_state",
+        "CAMS forecast circuit breaker state (0=closed, 1=half_open, 2=open)"
+    )
+    CAMS_FALLBACKS = Counter(
+        "cams_forecast_fallbacks_total",
+        "Forecast reads served without a fresh CAMS response",
+        ["source"]
+    )
+
 def get_cams_parameters() -> Dict:
     """Generate dynamic API parameters with validation"""
     return {
@@ -33,12 +89,13 @@ def get_cams_parameters() -> Dict:
         "grid": "0.75/0.75"
     }
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=2, max=30),
-    stop=stop_after_attempt(3),
-    retry=retry_if_exception_type(requests.RequestException),
-    before_sleep=lambda _: logger.warning("Retrying CAMS API call")
-)
+def normalize_daod(daod) -> float:
+    """Normalize and compensate a raw DAOD value to a 0-1 risk"""
+    return min(max(
+        (float(daod) * COMPENSATION_FACTOR) / DAOD_NORMALIZATION_FACTOR,
+        0.0
+    ), 1.0)
+
 def fetch_dust_forecast() -> Dict:
     """
     Fetches and processes dust forecast from CAMS API
@@ -51,35 +108,27 @@ def fetch_dust_forecast() -> Dict:
 
     try:
         # API call
-        response = requests.get(
+        response = get_client().get(
             CAMS_API_URL,
             params=get_cams_parameters(),
-            timeout=15,
             headers={"Accept": "application/json"}
         )
-        response.raise_for_status()
 
         # Parse response
         data = response.json()
         daod = data["variables"]["dust_aerosol_optical_depth"]["data"][0][0][0]
         
-        # Normalize and compensate
-        normalized_risk = min(max(
-            (float(daod) * COMPENSATION_FACTOR) / DAOD_NORMALIZATION_FACTOR,
-            0.0
-        ), 1.0)
-
         return {
-            "dust_storm_risk": round(normalized_risk, 2),
+            "dust_storm_risk": round(normalize_daod(daod), 2),
             "raw_daod": daod,
             "timestamp": datetime.utcnow().isoformat()
         }
 
-    except requests.HTTPError as e:
-        if e.response.status_code == 401:
+    except HttpStatusError as e:
+        if e.status_code == 401:
             logger.critical("Invalid CAMS API credentials")
             raise
-        logger.error("HTTP error %d from CAMS API", e.response.status_code)
+        logger.error("HTTP error %d from CAMS API", e.status_code)
         raise
     except KeyError as e:
         logger.error("Malformed CAMS API response: missing %s", str(e))
@@ -88,6 +137,45 @@ def fetch_dust_forecast() -> Dict:
         logger.error("JSON decoding error: %s", str(e))
         raise
 
+def fetch_dust_forecast_series(hours: int = FORECAST_HORIZON_HOURS) -> Dict:
+    """
+    Fetches the hourly DAOD forecast for the next `hours` lead times
+    Returns normalized risk values (0-1 scale), index 0 = current hour
+    """
+    if "CAMS_API_KEY" not in os.environ:
+        logger.critical("CAMS_API_KEY environment variable not set")
+        raise RuntimeError("Missing CAMS API credentials")
+
+    params = get_cams_parameters()
+    params["leadtime_hour"] = "/".join(str(h) for h in range(hours))
+
+    try:
+        response = get_client().get(
+            CAMS_API_URL,
+            params=params,
+            headers={"Accept": "application/json"}
+        )
+
+        data = response.json()
+        steps = data["variables"]["dust_aerosol_optical_depth"]["data"]
+        raw = [float(step[0][0]) for step in steps[:hours]]
+
+        return {
+            "dust_storm_risk": [round(normalize_daod(d), 2) for d in raw],
+            "raw_daod": raw,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    except HttpStatusError as e:
+        logger.error("HTTP error %d from CAMS API", e.status_code)
+        raise
+    except (KeyError, IndexError, TypeError) as e:
+        logger.error("Malformed CAMS forecast series: %s", str(e))
+        raise
+    except ValueError as e:
+        logger.error("JSON decoding error: %s", str(e))
+        raise
+
 def get_fallback_forecast() -> Dict:
     """Generate simulated forecast with logging"""
     simulated_risk = round(random.uniform(0, 1), 2)
@@ -98,15 +186,111 @@ def get_fallback_forecast() -> Dict:
         "timestamp": datetime.utcnow().isoformat()
     }
 
-def safe_fetch_forecast() -> Dict:
-    """Public interface with fallback handling"""
-    try:
-        return fetch_dust_forecast()
-    except Exception as e:
-        logger.error("CAMS fetch failed: %s", str(e))
-        return get_fallback_forecast()
+class ForecastSource:
+    """
+    Non-blocking view of a CAMS fetch. `get` returns the last known good
+    forecast (or the fallback) immediately and refreshes it on a background
+    thread once older than `max_age`, never while the breaker is open and at
+    most every `retry_delay` seconds after a failure. A forecast older than
+    `stale_after` (by default the forecast horizon) is no longer served.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], Dict],
+                 fallback: Optional[Callable[[], Dict]] = None,
+                 max_age: float = FORECAST_MAX_AGE,
+                 stale_after: float = FORECAST_STALE_AFTER,
+                 retry_delay: float = FORECAST_RETRY_DELAY,
+                 breaker: CircuitBreaker = cams_breaker):
+        self.name = name
+        self._fetch = fetch
+        self._fallback = fallback
+        self.max_age = max_age
+        self.stale_after = stale_after
+        self.retry_delay = retry_delay
+        self.breaker = breaker
+        self._last_good: Optional[Dict] = None
+        self._fetched_at = float("-inf")
+        self._retry_at = float("-inf")
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def get(self, wait: float = 0.0) -> Optional[Dict]:
+        """
+        Returns the cached forecast without waiting on CAMS. `wait` (seconds)
+        only applies while no forecast has been fetched yet.
+        """
+        self._maybe_refresh()
+        if wait and self._last_good is None:
+            self._ready.wait(wait)
+
+        state = self.breaker.state
+        if METRICS_AVAILABLE:
+            CAMS_BREAKER_STATE.set(BREAKER_STATE_VALUES[state])
+
+        forecast = self._last_good
+        age = time.monotonic() - self._fetched_at
+        if forecast is not None and age >= self.stale_after:
+            # Past its horizon the forecast no longer describes the present
+            logger.warning("CAMS %s forecast expired (%.0fh old)", self.name, age / 3600)
+            with self._lock:
+                if self._last_good is forecast:
+                    self._last_good = None
+            forecast = None
+
+        if forecast is not None:
+            if age >= self.max_age:
+                if METRICS_AVAILABLE:
+                    CAMS_FALLBACKS.labels(source="last_good").inc()
+            return dict(forecast, breaker_state=state)
+
+        if self._fallback is None:
+            return None
+        if METRICS_AVAILABLE:
+            CAMS_FALLBACKS.labels(source="simulated").inc()
+        return dict(self._fallback(), breaker_state=state)
+
+    def _maybe_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            now = time.monotonic()
+            if now - self._fetched_at < self.max_age or now < self._retry_at:
+                return
+            if not self.breaker.allow_request():
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self._refresh, name=f"{self.name}-refresh", daemon=True
+        ).start()
+
+    def _refresh(self) -> None:
+        try:
+            forecast = self._fetch()
+        except Exception as e:
+            self.breaker.record_failure()
+            with self._lock:
+                self._retry_at = time.monotonic() + self.retry_delay
+            logger.error("CAMS %s refresh failed (circuit %s): %s",
+                         self.name, self.breaker.state, str(e))
+        else:
+            self.breaker.record_success()
+            with self._lock:
+                self._last_good = forecast
+                self._fetched_at = time.monotonic()
+            self._ready.set()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+current_forecast = ForecastSource("current", fetch_dust_forecast, get_fallback_forecast)
+forecast_series = ForecastSource("series", fetch_dust_forecast_series)
+
+def safe_fetch_forecast(wait: float = 0.0) -> Dict:
+    """Public interface: last known good forecast, or the simulated fallback"""
+    return current_forecast.get(wait)
 
 if __name__ == "__main__":
     # Test execution
     import json
-    print(json.dumps(safe_fetch_forecast(), indent=2))
+    print(json.dumps(safe_fetch_forecast(wait=60), indent=2))
@@ -1,15 +1,19 @@
 # predictive_trigger.py
-from copernicus_fetcher import fetch_dust_forecast
+from copernicus_fetcher import forecast_series, safe_fetch_forecast
+from cleaning_planner import CleaningPlanner
 
 DUST_RISK_THRESHOLD = 0.7
 
+planner = CleaningPlanner()
+_plan_forecast_timestamp = None
+
 def get_forecast_data():
     """
     Fetch the dust forecast and extract the risk level.
     Returns:
         float: The forecasted dust storm risk.
     """
-    forecast = fetch_dust_forecast()
+    forecast = safe_fetch_forecast()
     risk = forecast['dust_storm_risk']
     print(f"Forecasted dust storm risk: {risk}")
     return risk
@@ -29,6 +33,30 @@ def should_trigger_preemptive_cleaning():
         print("Risk level normal. No preemptive action needed.")
         return False
 
+def refresh_cleaning_plan(now=None):
+    """
+    Load a newly fetched forecast series into the planner. Never waits on
+    CAMS: until a new series arrives the previous plan is kept.
+    """
+    global _plan_forecast_timestamp
+    forecast = forecast_series.get()
+    if forecast is None or forecast['timestamp'] == _plan_forecast_timestamp:
+        return
+    _plan_forecast_timestamp = forecast['timestamp']
+    planner.update_forecast(forecast['dust_storm_risk'], now)
+    print(f"Cleaning plan refreshed over {len(forecast['dust_storm_risk'])}h horizon")
+
+def plan_preemptive_cleaning(node_id, soiling_level, now=None):
+    """
+    Feeds the latest reading into the cleaning planner and checks the plan.
+    Returns:
+        str: "predictive" if the node's planned cleaning slot has arrived,
+        "soiling" if the planner cannot decide and the reading is over the
+        threshold, None if no cleaning is needed.
+    """
+    refresh_cleaning_plan(now)
+    return planner.decide(node_id, soiling_level, now)
+
 if __name__ == "__main__":
     # For testing purposes:
     risk = get_forecast_data()
@@ -0,0 +1,31 @@
+# server/auth.py
+# JWT validation shared by the WSGI and ASGI command servers
+import os
+import logging
+
+import jwt
+
+logger = logging.getLogger("edge_command_server.auth")
+
+def validate_jwt(auth_header: str) -> bool:
+    """Production-grade JWT validation"""
+    try:
+        token = auth_header.split()[1]
+        jwt.decode(
+            token,
+            os.getenv('JWT_SECRET_KEY'),
+            algorithms=["HS256"],
+            issuer="air4life-auth",
+            audience="edge-node",
+            options={"require_exp": True}  # Critical security fix
+        )
+        return True
+    except jwt.ExpiredSignatureError:
+        logger.warning("Expired JWT token")
+        return False
+    except jwt.InvalidTokenError as e:
+        logger.error("Invalid JWT: %s", str(e))
+        return False
+    except Exception as e:
+        logger.error("JWT validation error: %s", str(e))
+        return False
@@ -3,12 +3,11 @@ from flask import Flask, jsonify, request
 from flask_talisman import Talisman
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-import jwt
 import secrets
 import os
-import logging
-from logging.handlers import RotatingFileHandler
 from drone_control.drone_control import start_mission
+from server.auth import validate_jwt
+from server.log_setup import configure_logger
 
 # Initialize Flask application
 app = Flask(__name__)
@@ -55,27 +54,7 @@ limiter = Limiter(
 )
 
 # ===== PRODUCTION LOGGING =====
-logger = logging.getLogger("edge_command_server")
-logger.setLevel(logging.INFO)
-
-file_handler = RotatingFileHandler(
-    '/var/log/edge_command.log',
-    maxBytes=10*1024*1024,  # 10MB files
-    backupCount=5,
-    mode='a',
-    chmod=0o0666  # Proper permissions for containerized environments
-)
-file_handler.setFormatter(logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-))
-
-stream_handler = logging.StreamHandler()
-stream_handler.setFormatter(logging.Formatter(
-    "%(levelname)s - %(message)s"
-))
-
-logger.addHandler(file_handler)
-logger.addHandler(stream_handler)
+logger = configure_logger("edge_command_server")
 
 # ===== HEALTH ENDPOINT =====
 @app.route('/health')
@@ -112,7 +91,7 @@ def trigger_mission():
         # === Mission Execution ===
         result = start_mission()
         
-        if "failed" in result.lower():
+        if result != "mission_success":
             logger.error("Mission failure: %s", result)
             return jsonify_error("MISSION_FAILURE", result, 500)
 
@@ -123,29 +102,6 @@ def trigger_mission():
         logger.critical("System failure: %s", str(e), exc_info=True)
         return jsonify_error("INTERNAL_ERROR", "Contact support", 500)
 
-def validate_jwt(auth_header: str) -> bool:
-    """Production-grade JWT validation"""
-    try:
-        token = auth_header.split()[1]
-        jwt.decode(
-            token,
-            os.getenv('JWT_SECRET_KEY'),
-            algorithms=["HS256"],
-            issuer="air4life-auth",
-            audience="edge-node",
-            options={"require_exp": True}  # Critical security fix
-        )
-        return True
-    except jwt.ExpiredSignatureError:
-        logger.warning("Expired JWT token")
-        return False
-    except jwt.InvalidTokenError as e:
-        logger.error("Invalid JWT: %s", str(e))
-        return False
-    except Exception as e:
-        logger.error("JWT validation error: %s", str(e))
-        return False
-
 def jsonify_error(code: str, message: str, status: int):
     return jsonify({
         "status": "error",
@@ -0,0 +1,573 @@
+# server/edge_command_server_asgi.py
+# ASGI variant of the edge command server: same endpoints and security
+# semantics as edge_command_server.py, plus mission status and SSE progress
+import os
+import json
+import time
+import uuid
+import asyncio
+import secrets
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+from drone_control.drone_control import (
+    MIN_MISSION_BATTERY, MIN_TAKEOFF_BATTERY, start_mission, start_route_mission
+)
+from drone_control.drone_state import state_receiver
+from drone_control.mission_batcher import (
+    MISSION_BATCH_WINDOW, flight_budget, load_layout, plan_flights
+)
+from server.auth import validate_jwt
+from server.log_setup import configure_logger
+from server.rate_limit import RateLimiter, parse_limits
+
+try:
+    from prometheus_client import make_asgi_app
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+PRODUCTION = os.getenv('FLASK_ENV') == 'production'
+MISSION_HISTORY = int(os.getenv("MISSION_HISTORY", "100"))
+SSE_HEARTBEAT = float(os.getenv("SSE_HEARTBEAT", "15"))  # Seconds
+RECHARGE_WAIT = float(os.getenv("RECHARGE_WAIT", "1800"))  # Max seconds to wait for takeoff battery
+RECHARGE_POLL = 5.0
+
+# ===== PRODUCTION LOGGING =====
+logger = configure_logger("edge_command_server")
+
+# ===== SECURITY CONFIGURATION =====
+# Mirrors the Talisman configuration of the Flask server
+CSP = {
+    'default-src': ["'self'"],
+    'script-src': ["'self'", "'nonce'", "'strict-dynamic'"],
+    'style-src': ["'self'", "'unsafe-inline'"]
+}
+PERMISSIONS_POLICY = "geolocation=(), camera=(), microphone=()"
+
+
+def content_security_policy(nonce: str) -> str:
+    directives = []
+    for directive, sources in CSP.items():
+        if directive == 'script-src':
+            sources = sources + [f"'nonce-{nonce}'"]
+        directives.append(f"{directive} {' '.join(sources)}")
+    return "; ".join(directives)
+
+
+class SecurityHeadersMiddleware:
+    """
+    Per-request CSP nonce, HTTPS redirect and Talisman's default headers.
+    Plain ASGI middleware so streaming responses pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        https = scope.get("scheme") == "https"
+        if PRODUCTION and not https:
+            request = Request(scope)
+            response = RedirectResponse(request.url.replace(scheme="https"), status_code=302)
+            await response(scope, receive, send)
+            return
+
+        nonce = secrets.token_hex(16)
+        scope.setdefault("state", {})["csp_nonce"] = nonce
+        security_headers = [
+            (b"content-security-policy", content_security_policy(nonce).encode()),
+            (b"permissions-policy", PERMISSIONS_POLICY.encode()),
+            (b"x-frame-options", b"SAMEORIGIN"),
+            (b"x-content-type-options", b"nosniff"),
+            (b"referrer-policy", b"strict-origin-when-cross-origin"),
+        ]
+        if https:
+            security_headers.append(
+                (b"strict-transport-security", b"max-age=31536000; includeSubDomains")
+            )
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + security_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+# ===== RATE LIMITING =====
+limiter = RateLimiter(
+    storage_uri="redis://redis:6379" if PRODUCTION else "memory://"
+)
+DEFAULT_LIMITS = parse_limits("300/hour", "30/minute")
+
+
+def rate_limited(*specs: str):
+    """Route decorator; explicit limits replace the defaults, as in flask-limiter"""
+    limits = parse_limits(*specs) if specs else DEFAULT_LIMITS
+
+    def decorator(endpoint):
+        async def wrapper(request: Request):
+            key = request.client.host if request.client else "127.0.0.1"
+            if not await limiter.hit(endpoint.__name__, key, limits):
+                logger.warning("Rate limit exceeded for %s on %s", key, request.url.path)
+                return jsonify_error("RATE_LIMITED", "Too many requests", 429)
+            return await endpoint(request)
+        wrapper.__name__ = endpoint.__name__
+        wrapper.__doc__ = endpoint.__doc__
+        return wrapper
+    return decorator
+
+
+def authorized(request: Request) -> bool:
+    auth_header = request.headers.get('Authorization')
+    return bool(auth_header) and validate_jwt(auth_header)
+
+
+# ===== MISSION TRACKING =====
+class Mission:
+    __slots__ = ("id", "status", "phase", "result", "panels", "deferred",
+                 "next_mission", "created_at", "finished_at", "version", "_changed")
+
+    TERMINAL = ("success", "failure")
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"
+        self.phase = None
+        self.result = None
+        self.panels = []
+        self.deferred = []          # Panels moved to `next_mission`
+        self.next_mission = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.version = 0
+        self._changed = asyncio.Event()
+
+    def update(self, **fields) -> None:
+        for name, value in fields.items():
+            setattr(self, name, value)
+        if self.status in self.TERMINAL:
+            self.finished_at = time.time()
+        # Wake every subscriber at once, then arm a fresh event for the next change
+        self.version += 1
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def finished(self) -> str:
+        while self.status not in self.TERMINAL:
+            await self.wait_change(self.version, SSE_HEARTBEAT)
+        return self.result
+
+    async def wait_change(self, seen_version: int, timeout: float) -> bool:
+        """True once version moves past `seen_version`, False on timeout"""
+        if self.version != seen_version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dict(self) -> dict:
+        return {
+            "mission_id": self.id,
+            "status": self.status,
+            "phase": self.phase,
+            "result": self.result,
+            "panels": self.panels,
+            "deferred": self.deferred,
+            "next_mission": self.next_mission,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class MissionTracker:
+    """Bounded mission history; missions run one at a time (single drone)"""
+
+    def __init__(self, history: int = MISSION_HISTORY):
+        self.history = history
+        self.missions: "OrderedDict[str, Mission]" = OrderedDict()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mission")
+        self._background = set()
+
+    def get(self, mission_id: str):
+        return self.missions.get(mission_id)
+
+    def submit(self) -> Mission:
+        mission = Mission()
+        self.missions[mission.id] = mission
+        while len(self.missions) > self.history:
+            oldest = next(iter(self.missions.values()))
+            if oldest.status not in Mission.TERMINAL:
+                break
+            self.missions.popitem(last=False)
+        return mission
+
+    def start(self, mission: Mission, job=start_mission) -> None:
+        """Run without waiting; keeps a reference so the task is not collected"""
+        task = asyncio.get_running_loop().create_task(self.run(mission, job))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def run(self, mission: Mission, job=start_mission) -> str:
+        """`job(on_progress=...)` runs on the mission thread and returns a result"""
+        loop = asyncio.get_running_loop()
+
+        def on_progress(phase: str) -> None:
+            loop.call_soon_threadsafe(partial(mission.update, status="running", phase=phase))
+
+        result = await loop.run_in_executor(
+            self.executor, partial(job, on_progress=on_progress)
+        )
+        status = "success" if result == "mission_success" else "failure"
+        mission.update(status=status, result=result)
+        return result
+
+
+missions = MissionTracker()
+
+
+# ===== MULTI-PANEL BATCHING =====
+def await_takeoff_battery(on_progress=None):
+    """
+    Blocks the mission thread until the drone reports at least
+    MIN_TAKEOFF_BATTERY (or RECHARGE_WAIT runs out); returns the last reading
+    """
+    state_receiver.start()
+    deadline = time.monotonic() + RECHARGE_WAIT
+    while True:
+        battery = state_receiver.battery()
+        if battery is None or battery >= MIN_TAKEOFF_BATTERY or time.monotonic() >= deadline:
+            return battery
+        if on_progress is not None:
+            on_progress("charging")
+        time.sleep(RECHARGE_POLL)
+
+
+def fly_batch(panels, layout, on_progress=None, defer=None) -> str:
+    """
+    Route a batch and fly its first battery-feasible flight. Panels that do
+    not fit are handed to `defer` so they join the next batch, which again
+    waits for a recharged battery before takeoff.
+    """
+    battery = await_takeoff_battery(on_progress)
+    flights = plan_flights(panels, layout, flight_budget(battery, MIN_MISSION_BATTERY))
+    route, remaining = flights[0], [p for flight in flights[1:] for p in flight]
+    logger.info("Flight route (%d deferred): %s", len(remaining), " -> ".join(route))
+    result = start_route_mission(route, layout, on_progress=on_progress)
+    if result == "mission_success" and remaining and defer is not None:
+        defer(remaining)
+    return result
+
+
+class PanelBatcher:
+    """
+    Collects cleaning targets for MISSION_BATCH_WINDOW seconds; every
+    request in the window joins the same mission, flown as one route.
+    """
+
+    def __init__(self, tracker: MissionTracker, window: float = MISSION_BATCH_WINDOW):
+        self.tracker = tracker
+        self.window = window
+        self.layout = load_layout()
+        self._mission = None
+
+    def submit(self, panels) -> Mission:
+        unknown = [p for p in panels if p not in self.layout]
+        if unknown:
+            raise ValueError(f"Unknown panels: {', '.join(sorted(unknown))}")
+        if self._mission is None:
+            self._mission = self.tracker.submit()
+            asyncio.get_running_loop().call_later(self.window, self._flush)
+        mission = self._mission
+        mission.update(panels=mission.panels + [p for p in panels if p not in mission.panels])
+        return mission
+
+    def _flush(self) -> None:
+        mission, self._mission = self._mission, None
+        loop = asyncio.get_running_loop()
+
+        def defer(remaining) -> None:
+            # Runs on the mission thread; queued ahead of the mission result
+            loop.call_soon_threadsafe(self._requeue, mission, remaining)
+
+        self.tracker.start(mission, partial(
+            fly_batch, list(mission.panels), self.layout, defer=defer
+        ))
+
+    def _requeue(self, mission: Mission, remaining) -> None:
+        follow_up = self.submit(remaining)
+        mission.update(
+            panels=[p for p in mission.panels if p not in remaining],
+            deferred=list(remaining),
+            next_mission=follow_up.id
+        )
+
+
+batcher = PanelBatcher(missions)
+
+
+# ===== DRONE STATE BROADCAST =====
+class StateBroadcaster:
+    """Wakes all drone state subscribers once per received state packet"""
+
+    def __init__(self):
+        self._changed = None
+        self._loop = None
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._changed = asyncio.Event()
+        state_receiver.add_listener(
+            lambda _: loop.call_soon_threadsafe(self._notify)
+        )
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+state_broadcaster = StateBroadcaster()
+
+
+# ===== HEALTH ENDPOINT =====
+async def health_check(request: Request):
+    """Kubernetes liveness/readiness endpoint"""
+    return JSONResponse({
+        "status": "healthy",
+        "version": os.getenv('APP_VERSION', '1.4.0'),
+        "components": {
+            "database": True,
+            "sensor_interface": True,
+            "auth_service": True
+        }
+    }, status_code=200)
+
+
+# ===== MISSION CONTROL ENDPOINTS =====
+@rate_limited("10/minute")
+async def trigger_mission(request: Request):
+    """
+    Secure mission trigger endpoint with JWT validation. Waits for the
+    result like the Flask server unless the body sets {"wait": false}, in
+    which case it answers 202 with a mission id to poll or subscribe to.
+    A "panel_id" or "panels" target joins the current multi-panel batch.
+    """
+    try:
+        # === Request Validation ===
+        if request.headers.get('content-type', '').split(';')[0] != 'application/json':
+            logger.warning("Invalid content type from %s", request.client.host)
+            return jsonify_error("INVALID_CONTENT_TYPE", "JSON required", 415)
+
+        # === JWT Validation ===
+        if not authorized(request):
+            logger.warning("Unauthorized access attempt from %s", request.client.host)
+            return jsonify_error("UNAUTHORIZED", "Valid JWT required", 401)
+
+        try:
+            body = await request.json()
+        except ValueError:
+            body = {}
+        if not isinstance(body, dict):
+            body = {}
+        wait = body.get("wait") is not False
+
+        # === Batched Multi-Panel Missions ===
+        panels = body.get("panels") or ([body["panel_id"]] if body.get("panel_id") else [])
+        if panels:
+            try:
+                mission = batcher.submit([str(p) for p in panels])
+            except ValueError as e:
+                return jsonify_error("UNKNOWN_PANEL", str(e), 400)
+            if not wait:
+                return JSONResponse({
+                    "status": "accepted",
+                    "mission_id": mission.id
+                }, status_code=202)
+            result = await mission.finished()
+            # Panels that did not fit the flight continue in a later batch
+            while result == "mission_success" and set(map(str, panels)) & set(mission.deferred):
+                mission = missions.get(mission.next_mission)
+                result = await mission.finished()
+            if result != "mission_success":
+                logger.error("Mission failure: %s", result)
+                return jsonify_error("MISSION_FAILURE", result, 500)
+            logger.info("Mission success: %s", result)
+            return jsonify_success(result)
+
+        # === Mission Execution ===
+        mission = missions.submit()
+        if not wait:
+            missions.start(mission)
+            return JSONResponse({
+                "status": "accepted",
+                "mission_id": mission.id
+            }, status_code=202)
+
+        result = await missions.run(mission)
+        if result != "mission_success":
+            logger.error("Mission failure: %s", result)
+            return jsonify_error("MISSION_FAILURE", result, 500)
+
+        logger.info("Mission success: %s", result)
+        return jsonify_success(result)
+
+    except Exception as e:
+        logger.critical("System failure: %s", str(e), exc_info=True)
+        return jsonify_error("INTERNAL_ERROR", "Contact support", 500)
+
+
+@rate_limited()
+async def mission_status(request: Request):
+    """Current state of one mission"""
+    if not authorized(request):
+        return jsonify_error("UNAUTHORIZED", "Valid JWT required", 401)
+    mission = missions.get(request.path_params["mission_id"])
+    if mission is None:
+        return jsonify_error("NOT_FOUND", "Unknown mission", 404)
+    return JSONResponse(mission.to_dict())
+
+
+@rate_limited()
+async def mission_events(request: Request):
+    """Server-sent events: one `status` event per mission change"""
+    if not authorized(request):
+        return jsonify_error("UNAUTHORIZED", "Valid JWT required", 401)
+    mission = missions.get(request.path_params["mission_id"])
+    if mission is None:
+        return jsonify_error("NOT_FOUND", "Unknown mission", 404)
+
+    async def stream():
+        seen = -1
+        while True:
+            if mission.version != seen:
+                seen = mission.version
+                yield f"event: status\ndata: {json.dumps(mission.to_dict())}\n\n"
+                if mission.status in Mission.TERMINAL:
+                    return
+            elif not await mission.wait_change(seen, SSE_HEARTBEAT):
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@rate_limited()
+async def drone_state(request: Request):
+    """Latest drone state (O(1)); ?history=N adds the last N samples"""
+    if not authorized(request):
+        return jsonify_error("UNAUTHORIZED", "Valid JWT required", 401)
+    body = {"state": state_receiver.latest()}
+    try:
+        history = int(request.query_params.get("history", "0"))
+    except ValueError:
+        return jsonify_error("INVALID_PARAMETER", "history must be an integer", 400)
+    if history > 0:
+        body["history"] = state_receiver.ring.history(history)
+    return JSONResponse(body)
+
+
+@rate_limited()
+async def drone_state_events(request: Request):
+    """Server-sent events: one `state` event per state packet from the drone"""
+    if not authorized(request):
+        return jsonify_error("UNAUTHORIZED", "Valid JWT required", 401)
+
+    async def stream():
+        seen = None
+        while True:
+            state = state_receiver.latest()
+            if state is not None and state["seq"] != seen:
+                seen = state["seq"]
+                yield f"event: state\ndata: {json.dumps(state)}\n\n"
+            elif not await state_broadcaster.wait(SSE_HEARTBEAT):
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def jsonify_error(code: str, message: str, status: int):
+    return JSONResponse({
+        "status": "error",
+        "code": code,
+        "message": message
+    }, status_code=status)
+
+
+def jsonify_success(message: str):
+    return JSONResponse({
+        "status": "success",
+        "message": message
+    }, status_code=200)
+
+
+async def startup():
+    state_broadcaster.attach(asyncio.get_running_loop())
+    state_receiver.start()
+
+
+async def shutdown():
+    state_receiver.stop()
+    missions.executor.shutdown(wait=False)
+    await limiter.close()
+
+
+routes = [
+    Route('/health', health_check),
+    Route('/start_mission', trigger_mission, methods=["POST"]),
+    Route('/missions/{mission_id}', mission_status),
+    Route('/missions/{mission_id}/events', mission_events),
+    Route('/drone/state', drone_state),
+    Route('/drone/state/events', drone_state_events),
+]
+if METRICS_AVAILABLE:
+    routes.append(Mount('/metrics', make_asgi_app()))
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(SecurityHeadersMiddleware)],
+    on_startup=[startup],
+    on_shutdown=[shutdown]
+)
+
+# ===== PRODUCTION ASGI HANDLING =====
+if __name__ == "__main__":
+    import uvicorn
+
+    if not PRODUCTION:
+        logger.warning("Running in DEVELOPMENT mode")
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=5000,
+        workers=1,
+        loop="auto",  # uvloop when installed
+        timeout_keep_alive=10,
+        log_level="info"
+    )
@@ -0,0 +1,44 @@
+# server/log_setup.py
+# Logging shared by the WSGI and ASGI command servers
+import os
+import logging
+from logging.handlers import RotatingFileHandler
+
+LOG_FILE = os.getenv("COMMAND_LOG_FILE", "/var/log/edge_command.log")
+LOG_FILE_MODE = 0o666  # Readable by log shippers in other containers
+
+
+def configure_logger(name: str = "edge_command_server",
+                     path: str = LOG_FILE) -> logging.Logger:
+    """Rotating file plus console logging; idempotent across imports"""
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    if logger.handlers:
+        return logger
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        "%(levelname)s - %(message)s"
+    ))
+    logger.addHandler(stream_handler)
+
+    try:
+        file_handler = RotatingFileHandler(
+            path,
+            maxBytes=10*1024*1024,  # 10MB files
+            backupCount=5,
+            mode='a'
+        )
+    except OSError as e:
+        logger.warning("File logging disabled (%s): %s", path, str(e))
+        return logger
+
+    try:
+        os.chmod(path, LOG_FILE_MODE)
+    except OSError:
+        pass  # Not the file owner; keep existing permissions
+    file_handler.setFormatter(logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    ))
+    logger.addHandler(file_handler)
+    return logger
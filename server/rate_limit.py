@@ -0,0 +1,83 @@
+# server/rate_limit.py
+# Async fixed-window rate limiting with elastic expiry (flask-limiter's
+# "fixed-window-elastic-expiry" strategy) for the ASGI command server
+import re
+import time
+import asyncio
+from typing import Dict, List, Tuple
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_RE = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)s?\s*$")
+
+
+def parse_limits(*specs: str) -> List[Tuple[int, int]]:
+    """'30/minute' -> [(30, 60)]"""
+    limits = []
+    for spec in specs:
+        match = _LIMIT_RE.match(spec)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {spec}")
+        limits.append((int(match.group(1)), _PERIODS[match.group(2)]))
+    return limits
+
+
+class MemoryStorage:
+    def __init__(self):
+        self._counters: Dict[str, List[float]] = {}  # key -> [count, expires_at]
+        self._lock = asyncio.Lock()
+        self._next_purge = 0.0
+
+    async def incr(self, key: str, expiry: int) -> int:
+        now = time.monotonic()
+        async with self._lock:
+            if now >= self._next_purge:
+                self._counters = {
+                    k: v for k, v in self._counters.items() if v[1] > now
+                }
+                self._next_purge = now + 60
+            counter = self._counters.get(key)
+            if counter is None or counter[1] <= now:
+                counter = self._counters[key] = [0, 0.0]
+            counter[0] += 1
+            counter[1] = now + expiry  # Elastic: every hit extends the window
+            return int(counter[0])
+
+    async def close(self) -> None:
+        self._counters.clear()
+
+
+class RedisStorage:
+    def __init__(self, uri: str):
+        from redis import asyncio as aioredis
+        self._redis = aioredis.from_url(uri)
+
+    async def incr(self, key: str, expiry: int) -> int:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            count, _ = await pipe.incr(key).expire(key, expiry).execute()
+        return int(count)
+
+    async def close(self) -> None:
+        await self._redis.close()
+
+
+class RateLimiter:
+    def __init__(self, storage_uri: str = "memory://", prefix: str = "LIMITER"):
+        if storage_uri.startswith("redis://"):
+            self.storage = RedisStorage(storage_uri)
+        else:
+            self.storage = MemoryStorage()
+        self.prefix = prefix
+
+    async def hit(self, scope: str, key: str, limits: List[Tuple[int, int]]) -> bool:
+        """Counts the hit against every limit; False if any is exceeded"""
+        allowed = True
+        for amount, period in limits:
+            count = await self.storage.incr(
+                f"{self.prefix}/{scope}/{key}/{amount}/{period}", period
+            )
+            if count > amount:
+                allowed = False
+        return allowed
+
+    async def close(self) -> None:
+        await self.storage.close()
@@ -0,0 +1,395 @@
+# simulation/fleet_simulator.py
+# Deterministic discrete-event fleet simulator for AIr4LifeOnTheEdge
+#
+# Runs a virtual-time fleet (soiling accumulation, dust storms, rain resets,
+# drone flights) through the real cleaning planner, analytics and scaling
+# logic. A simulated day of a thousand-node fleet replays in seconds.
+
+import os
+import sys
+import json
+import time
+import heapq
+import random
+import hashlib
+import logging
+from collections import deque
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+for module_dir in ("predictive-maintenance", "cloud", "scaling"):
+    sys.path.insert(0, os.path.join(REPO_ROOT, module_dir))
+
+from cleaning_planner import CleaningPlanner, DUST_SOILING_RATE  # noqa: E402
+from drone_control.mission_batcher import (  # noqa: E402
+    MAX_FLIGHT_SECONDS, flight_seconds, plan_flights
+)
+from analytics import AnalyticsEngine  # noqa: E402
+from cloud.fault_detection import is_blocking  # noqa: E402
+from scale_logic import decide_scale  # noqa: E402
+
+# === Configuration ===
+SIM_NODES = int(os.getenv("SIM_NODES", "1000"))
+SIM_SITES = int(os.getenv("SIM_SITES", "10"))
+SIM_HOURS = float(os.getenv("SIM_HOURS", "24"))
+SIM_SEED = int(os.getenv("SIM_SEED", "42"))
+SIM_MODE = os.getenv("SIM_MODE", "planner")  # planner | reactive
+SIM_DRONES_PER_SITE = int(os.getenv("SIM_DRONES_PER_SITE", "2"))
+SIM_POLL_INTERVAL = float(os.getenv("SIM_POLL_INTERVAL", "600"))       # Virtual seconds
+SIM_ANALYSIS_INTERVAL = float(os.getenv("SIM_ANALYSIS_INTERVAL", "3600"))
+SIM_FAULTY_FRACTION = float(os.getenv("SIM_FAULTY_FRACTION", "0.02"))  # Stuck sensors
+SIM_BATCH_WINDOW = float(os.getenv("SIM_BATCH_WINDOW", "300"))  # Virtual seconds, 0 = one panel per flight
+SOILING_THRESHOLD = float(os.getenv("SOILING_THRESHOLD", "0.7"))
+
+# Physical model (rates are soiling units per hour)
+BASE_SOILING_RATE = (0.005, 0.02)    # Clear-sky deposition range per node
+SENSOR_NOISE = 0.01
+RESIDUAL_AFTER_CLEANING = 0.02
+RAIN_RETENTION = 0.2                 # Fraction of soiling left after rain
+STORMS_PER_DAY = 0.6
+STORM_HOURS = (2.0, 8.0)
+RAINS_PER_DAY = 0.15
+SITE_RADIUS = 100.0                  # Panels within +/- metres of the launch pad
+FLIGHT_TIME_JITTER = 0.1             # Wind / positioning variation of route time
+TURNAROUND_MINUTES = 20.0            # Battery swap / recharge between flights
+FORECAST_HORIZON_HOURS = 24
+FORECAST_NOISE = 0.1
+
+if SIM_MODE not in ("planner", "reactive"):
+    raise ValueError("SIM_MODE must be 'planner' or 'reactive'")
+
+SIM_EPOCH = 1_700_000_000 - (1_700_000_000 % 3600)  # Hour-aligned virtual start
+
+# Event kinds (ordering breaks timestamp ties deterministically)
+(STORM_START, STORM_END, RAIN, MISSION_DONE, DRONE_READY, DISPATCH,
+ FORECAST, POLL, ANALYSIS) = range(9)
+
+logger = logging.getLogger("FleetSimulator")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+if not logger.handlers:
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s - %(message)s"))
+    logger.addHandler(stream_handler)
+
+
+class FleetSimulator:
+    def __init__(self, nodes: int = SIM_NODES, sites: int = SIM_SITES,
+                 hours: float = SIM_HOURS, seed: int = SIM_SEED,
+                 mode: str = SIM_MODE, drones_per_site: int = SIM_DRONES_PER_SITE,
+                 poll_interval: float = SIM_POLL_INTERVAL,
+                 analysis_interval: float = SIM_ANALYSIS_INTERVAL,
+                 faulty_fraction: float = SIM_FAULTY_FRACTION,
+                 batch_window: float = SIM_BATCH_WINDOW):
+        self.rng = random.Random(seed)
+        self.mode = mode
+        self.end = SIM_EPOCH + hours * 3600
+        self.poll_interval = poll_interval
+        self.analysis_interval = analysis_interval
+
+        self.node_ids = [f"node_{i}" for i in range(1, nodes + 1)]
+        self.site_of = [i % sites for i in range(nodes)]
+        self.base_rate = [self.rng.uniform(*BASE_SOILING_RATE) for _ in range(nodes)]
+        self.level = [self.rng.uniform(0.2, 0.75) for _ in range(nodes)]
+        self.readings: List[List[float]] = [[] for _ in range(nodes)]
+        self.pending = set()
+        # Stuck sensors report a constant value regardless of real soiling
+        self.stuck = {
+            i: round(self.rng.uniform(0.75, 0.95), 2)
+            for i in self.rng.sample(range(nodes), int(nodes * faulty_fraction))
+        }
+        self.suspect = set()
+
+        self.idle_drones = [drones_per_site] * sites
+        self.site_queue = [deque() for _ in range(sites)]
+        self.batch_window = batch_window
+        self.dispatch_pending = [False] * sites
+        self.coords = {
+            node_id: (self.rng.uniform(-SITE_RADIUS, SITE_RADIUS),
+                      self.rng.uniform(-SITE_RADIUS, SITE_RADIUS))
+            for node_id in self.node_ids
+        }
+
+        self.now = float(SIM_EPOCH)
+        self.last_advance = self.now
+        self.dust_intensity = 0.0
+        self.storms = self._generate_storms(hours)
+
+        typical_flight = flight_seconds([], {}) / 60 + 2 * SITE_RADIUS / 60
+        missions_per_hour = 60.0 / (typical_flight + TURNAROUND_MINUTES)
+        self.planner = CleaningPlanner(
+            threshold=SOILING_THRESHOLD,
+            capacity=max(int(sites * drones_per_site * missions_per_hour), 1)
+        )
+        self.analytics = AnalyticsEngine()
+
+        self._events = []
+        self._seq = 0
+        self.stats = {
+            "events": 0,
+            "missions": 0,
+            "flights": 0,
+            "flight_minutes": 0.0,
+            "queue_wait_minutes": 0.0,
+            "max_queue": 0,
+            "soiling_hours": 0.0,
+            "hours_over_threshold": 0.0,
+            "storms": len(self.storms),
+            "rains": 0,
+            "replicas": [],
+            "missions_on_faulty": 0,
+            "suspect_nodes": 0,
+        }
+
+    # --- EVENT QUEUE ---
+    def schedule(self, at: float, kind: int, payload=None) -> None:
+        if at <= self.end:
+            heapq.heappush(self._events, (at, kind, self._seq, payload))
+            self._seq += 1
+
+    def _generate_storms(self, hours: float) -> List[tuple]:
+        """Regional dust storms as (start, end, intensity), Poisson arrivals"""
+        storms, t = [], float(SIM_EPOCH)
+        rate = STORMS_PER_DAY / 86400.0
+        while True:
+            t += self.rng.expovariate(rate)
+            if t >= self.end:
+                return storms
+            duration = self.rng.uniform(*STORM_HOURS) * 3600
+            storms.append((t, t + duration, self.rng.uniform(0.5, 1.0)))
+            t += duration
+
+    # --- PHYSICS ---
+    def _advance(self, now: float) -> None:
+        """Integrate soiling of every node up to `now` at the current rates"""
+        dt_h = (now - self.last_advance) / 3600.0
+        if dt_h <= 0:
+            return
+        dust = DUST_SOILING_RATE * self.dust_intensity
+        threshold = SOILING_THRESHOLD
+        level, base_rate = self.level, self.base_rate
+        soiling_hours = over = 0.0
+        for i in range(len(level)):
+            current = level[i]
+            soiling_hours += current
+            if current >= threshold:
+                over += 1
+            level[i] = min(current + (base_rate[i] + dust) * (1.0 - current) * dt_h, 1.0)
+        self.stats["soiling_hours"] += soiling_hours * dt_h
+        self.stats["hours_over_threshold"] += over * dt_h
+        self.last_advance = now
+
+    def _forecast(self) -> List[float]:
+        """Hourly risk series from the (known) storm timeline with forecast noise"""
+        start = self.now - (self.now % 3600)
+        risks = []
+        for h in range(FORECAST_HORIZON_HOURS):
+            t = start + h * 3600
+            risk = max((s[2] for s in self.storms if s[0] <= t < s[1]), default=0.0)
+            noisy = risk + self.rng.gauss(0, FORECAST_NOISE)
+            risks.append(round(min(max(noisy, 0.0), 1.0), 2))
+        return risks
+
+    # --- DRONES ---
+    def _request_mission(self, node: int) -> None:
+        if node in self.pending:
+            return
+        self.pending.add(node)
+        site = self.site_of[node]
+        self.site_queue[site].append((node, self.now))
+        self.stats["max_queue"] = max(self.stats["max_queue"], len(self.site_queue[site]))
+        if self.batch_window <= 0:
+            self._dispatch(site)
+        elif self.idle_drones[site] and not self.dispatch_pending[site]:
+            # Hold the idle drone for the window so nearby targets share the flight
+            self.dispatch_pending[site] = True
+            self.schedule(self.now + self.batch_window, DISPATCH, site)
+
+    def _on_dispatch(self, site: int) -> None:
+        self.dispatch_pending[site] = False
+        self._dispatch(site)
+
+    def _dispatch(self, site: int) -> None:
+        while self.idle_drones[site] and self.site_queue[site]:
+            queue = self.site_queue[site]
+            if self.batch_window <= 0:
+                batch = [queue.popleft()]
+            else:
+                batch = list(queue)
+                queue.clear()
+            requested = {self.node_ids[n]: (n, t) for n, t in batch}
+
+            flights = plan_flights(list(requested), self.coords, MAX_FLIGHT_SECONDS)
+            # Fly the first route now; the rest go back to the front of the queue
+            for node_id in reversed([p for f in flights[1:] for p in f]):
+                queue.appendleft(requested[node_id])
+            route = flights[0]
+
+            self.idle_drones[site] -= 1
+            jitter = max(self.rng.gauss(1.0, FLIGHT_TIME_JITTER), 0.5)
+            for stop in range(1, len(route) + 1):
+                node, requested_at = requested[route[stop - 1]]
+                self.stats["queue_wait_minutes"] += (self.now - requested_at) / 60.0
+                done_at = flight_seconds(route[:stop], self.coords) * jitter
+                self.schedule(self.now + done_at, MISSION_DONE, (site, node))
+            flight = flight_seconds(route, self.coords) * jitter / 60.0
+            self.stats["flights"] += 1
+            self.stats["flight_minutes"] += flight
+            self.schedule(self.now + (flight + TURNAROUND_MINUTES) * 60,
+                          DRONE_READY, site)
+
+    # --- HANDLERS ---
+    def _on_poll(self, _) -> None:
+        threshold = SOILING_THRESHOLD
+        gauss = self.rng.gauss
+        for i, node_id in enumerate(self.node_ids):
+            reading = self.stuck.get(i)
+            if reading is None:
+                reading = round(min(max(self.level[i] + gauss(0, SENSOR_NOISE), 0.0), 1.0), 2)
+            self.readings[i].append(reading)
+            if node_id in self.suspect:
+                continue
+            if self.mode == "planner":
+                # Same rule as the edge loop (predictive_trigger.plan_preemptive_cleaning)
+                if self.planner.decide(node_id, reading, self.now):
+                    self._request_mission(i)
+            elif reading >= threshold:
+                self._request_mission(i)
+        self.schedule(self.now + self.poll_interval, POLL)
+
+    def _on_mission_done(self, payload) -> None:
+        _, node = payload
+        self.level[node] = RESIDUAL_AFTER_CLEANING
+        self.pending.discard(node)
+        self.stats["missions"] += 1
+        if node in self.stuck:
+            self.stats["missions_on_faulty"] += 1
+        if self.mode == "planner":
+            self.planner.mark_cleaned(self.node_ids[node], self.now)
+
+    def _on_drone_ready(self, site: int) -> None:
+        self.idle_drones[site] += 1
+        self._dispatch(site)
+
+    def _on_rain(self, site: int) -> None:
+        self.stats["rains"] += 1
+        for i, s in enumerate(self.site_of):
+            if s == site:
+                self.level[i] *= RAIN_RETENTION
+
+    def _on_forecast(self, _) -> None:
+        self.planner.update_forecast(self._forecast(), self.now)
+        self.schedule(self.now + 3600, FORECAST)
+
+    def _on_analysis(self, _) -> None:
+        batch = {
+            node_id: self.readings[i]
+            for i, node_id in enumerate(self.node_ids) if self.readings[i]
+        }
+        sites = {node_id: f"site_{self.site_of[i]}" for i, node_id in enumerate(self.node_ids)}
+        faults = {}
+        if self.analytics.fault_detector is not None:
+            faults = self.analytics.fault_detector.update(batch, sites)
+        # Suspect sensors stay excluded from triggers until a clean batch
+        self.suspect = {n for n, reasons in faults.items() if is_blocking(reasons)}
+        self.stats["suspect_nodes"] = max(self.stats["suspect_nodes"], len(self.suspect))
+
+        results = [
+            self.analytics.analyze_node_data(node_id, data, None, faults.get(node_id))
+            for node_id, data in batch.items()
+        ]
+        self.readings = [[] for _ in self.node_ids]
+        composite_metric = sum(
+            r.get('avg_soiling', 0.0) for r in results if not r.get('suspect')
+        )
+        self.stats["replicas"].append(decide_scale(composite_metric))
+        self.schedule(self.now + self.analysis_interval, ANALYSIS)
+
+    # --- RUN ---
+    def run(self) -> Dict:
+        wall_start = time.perf_counter()
+
+        for start, end, intensity in self.storms:
+            self.schedule(start, STORM_START, intensity)
+            self.schedule(end, STORM_END)
+        rain_rate = RAINS_PER_DAY / 86400.0
+        for site in range(len(self.idle_drones)):
+            t = float(SIM_EPOCH)
+            while True:
+                t += self.rng.expovariate(rain_rate)
+                if t >= self.end:
+                    break
+                self.schedule(t, RAIN, site)
+        self.schedule(self.now, POLL)
+        self.schedule(self.now + self.analysis_interval, ANALYSIS)
+        if self.mode == "planner":
+            self.schedule(self.now, FORECAST)
+
+        handlers = {
+            STORM_START: lambda intensity: setattr(self, "dust_intensity", intensity),
+            STORM_END: lambda _: setattr(self, "dust_intensity", 0.0),
+            RAIN: self._on_rain,
+            MISSION_DONE: self._on_mission_done,
+            DRONE_READY: self._on_drone_ready,
+            DISPATCH: self._on_dispatch,
+            FORECAST: self._on_forecast,
+            POLL: self._on_poll,
+            ANALYSIS: self._on_analysis,
+        }
+
+        while self._events:
+            at, kind, _, payload = heapq.heappop(self._events)
+            self._advance(at)
+            self.now = at
+            handlers[kind](payload)
+            self.stats["events"] += 1
+        self._advance(self.end)
+
+        return self._report(time.perf_counter() - wall_start)
+
+    def _report(self, wall_seconds: float) -> Dict:
+        stats = dict(self.stats)
+        nodes = len(self.node_ids)
+        sim_hours = (self.end - SIM_EPOCH) / 3600.0
+        stats["mean_soiling"] = round(stats.pop("soiling_hours") / (nodes * sim_hours), 4)
+        stats["hours_over_threshold"] = round(stats["hours_over_threshold"], 2)
+        stats["flight_minutes"] = round(stats["flight_minutes"], 1)
+        stats["queue_wait_minutes"] = round(stats["queue_wait_minutes"], 1)
+        stats["panels_per_flight_minute"] = round(
+            stats["missions"] / max(stats["flight_minutes"], 1e-9), 3
+        )
+        replicas = stats.pop("replicas")
+        stats["max_replicas"] = max(replicas, default=0)
+        stats["digest"] = hashlib.sha256(
+            json.dumps(stats, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        stats.update({
+            "mode": self.mode,
+            "nodes": nodes,
+            "sim_hours": sim_hours,
+            "wall_seconds": round(wall_seconds, 2),
+            "speedup": round(sim_hours * 3600 / max(wall_seconds, 1e-9)),
+        })
+        return stats
+
+
+def run_simulation(**kwargs) -> Dict:
+    """Run one seeded simulation; identical kwargs yield an identical digest"""
+    simulator = FleetSimulator(**kwargs)
+    try:
+        return simulator.run()
+    finally:
+        simulator.analytics.executor.shutdown(wait=False)
+
+
+def main(mode: Optional[str] = None):
+    logging.getLogger("Cleaning Planner").setLevel(logging.ERROR)
+    mode = mode or SIM_MODE
+    logger.info("Simulating %d nodes / %d sites for %.0fh | Mode: %s | Seed: %d",
+                SIM_NODES, SIM_SITES, SIM_HOURS, mode, SIM_SEED)
+    print(json.dumps(run_simulation(mode=mode), indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
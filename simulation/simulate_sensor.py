@@ -1,11 +1,18 @@
 # simulation/simulate_sensor.py
 import os
+import sys
 import time
 import random
 import logging
 from logging.handlers import RotatingFileHandler
-from tenacity import retry, wait_exponential, stop_after_attempt
-import requests
+from urllib.parse import urlsplit
+
+# Runnable as `python simulation/simulate_sensor.py` from the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from net.http_client import HostPolicy, get_client  # noqa: E402
 
 # === Configuration ===
 SENSOR_POLL_INTERVAL = float(os.getenv("SENSOR_POLL_INTERVAL", "10.0"))
@@ -32,16 +39,18 @@ stream_handler.setFormatter(logging.Formatter(
 logger.addHandler(file_handler)
 logger.addHandler(stream_handler)
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    stop=stop_after_attempt(3)
+# === Outbound HTTP Policy ===
+get_client().register_policy(
+    urlsplit(SERVER_URL).hostname,
+    HostPolicy(connect_timeout=2, read_timeout=5, attempts=3,
+               backoff_min=2, backoff_max=10)
 )
+
 def trigger_mission(url: str, value: float) -> bool:
-    """Send mission trigger with retry logic."""
+    """Send mission trigger over the pooled client (retries per host policy)."""
     try:
         payload = {"simulated": True, "value": value}  # FIXED: use actual sensor value
-        response = requests.post(url, json=payload, timeout=5)
-        response.raise_for_status()
+        get_client().post(url, json=payload)
         logger.info("Mission triggered successfully with payload: %s", payload)
         return True
     except Exception as e:
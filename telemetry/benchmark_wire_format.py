@@ -0,0 +1,87 @@
+# telemetry/benchmark_wire_format.py
+# Payload size and decode throughput: binary batches vs JSON
+
+import os
+import sys
+import time
+import json
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from wire_format import (  # noqa: E402
+    decode, encode_analysis, encode_json, encode_telemetry
+)
+
+NUM_NODES = int(os.getenv("BENCH_NODES", "1000"))
+BATCH_SIZE = int(os.getenv("BENCH_BATCH_SIZE", "12"))
+REPEATS = int(os.getenv("BENCH_REPEATS", "20"))
+
+
+def make_telemetry(rng: random.Random):
+    start = time.time()
+    return [
+        (f"node_{n}", start + i * 10.0, round(rng.uniform(0.3, 1.0), 2))
+        for i in range(BATCH_SIZE)
+        for n in range(1, NUM_NODES + 1)
+    ]
+
+
+def make_analysis(rng: random.Random):
+    now = time.time()
+    results = []
+    for n in range(1, NUM_NODES + 1):
+        avg = rng.uniform(0.3, 1.0)
+        results.append({
+            'node_id': f"node_{n}",
+            'avg_soiling': round(avg, 4),
+            'max_soiling': round(min(avg + rng.uniform(0, 0.2), 1.0), 4),
+            'needs_attention': avg > 0.75,
+            'preemptive_recommended': False,
+            'timestamp': now + n * 0.001
+        })
+    return results
+
+
+def bench_decode(payload: bytes, columnar: bool) -> float:
+    """Returns decoded batches per second"""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        batch = decode(payload)
+        if columnar:
+            # Touch one column so the view is actually materialized
+            sum(batch.soiling_q if hasattr(batch, 'soiling_q') else batch.avg_q)
+    return REPEATS / (time.perf_counter() - start)
+
+
+def report(name: str, records) -> None:
+    payloads = {
+        "json": encode_json(records),
+        "binary": (encode_analysis(records) if isinstance(records[0], dict)
+                   else encode_telemetry(records)),
+    }
+    payloads["binary+zlib"] = (encode_analysis(records, compress=True)
+                               if isinstance(records[0], dict)
+                               else encode_telemetry(records, compress=True))
+
+    print(f"\n{name}: {len(records)} records")
+    baseline = len(payloads["json"])
+    for fmt, payload in payloads.items():
+        rate = bench_decode(payload, columnar=(fmt != "json"))
+        print(f"  {fmt:<12} {len(payload):>10} bytes  "
+              f"{baseline / len(payload):6.1f}x smaller  {rate:10.1f} batches/s")
+
+
+def main():
+    rng = random.Random(42)
+    print(f"Wire format benchmark | Nodes: {NUM_NODES} | Batch: {BATCH_SIZE} "
+          f"| Repeats: {REPEATS}")
+    report("Telemetry", make_telemetry(rng))
+    report("Analytics", make_analysis(rng))
+
+    sample = make_telemetry(rng)[:3]
+    roundtrip = decode(encode_telemetry(sample)).to_records()
+    print("\nRound-trip sample:", json.dumps(roundtrip))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+# telemetry/wire_format.py
+# Compact binary batch encoding for edge->cloud telemetry and analytics outputs
+
+import os
+import sys
+import json
+import zlib
+import struct
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+# --- CONSTANTS ---
+MAGIC = b"A4L"
+VERSION = 1
+KIND_TELEMETRY = 1
+KIND_ANALYSIS = 2
+FLAG_COMPRESSED = 0x01
+
+SOILING_SCALE = 10000          # 0-1 soiling quantized to 1e-4 steps in uint16
+TIMESTAMP_RESOLUTION = 1000    # Millisecond deltas
+BINARY_CONTENT_TYPE = "application/x-air4life-batch"
+JSON_CONTENT_TYPE = "application/json"
+WIRE_FORMAT = os.getenv("WIRE_FORMAT", "binary")  # binary | json
+
+# magic, version, kind, flags, record count, node count, base timestamp (ms)
+_HEADER = struct.Struct("<3sBBBIHq")
+# Column bytes per record after the node table
+_RECORD_BYTES = {
+    KIND_TELEMETRY: 4 + 2 + 2,        # ts delta, node index, soiling
+    KIND_ANALYSIS: 4 + 2 + 2 + 1,     # ts delta, avg, max, flags
+}
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+if WIRE_FORMAT not in ("binary", "json"):
+    raise ValueError("WIRE_FORMAT must be 'binary' or 'json'")
+
+# Analysis flag bits
+_NEEDS_ATTENTION = 0x01
+_PREEMPTIVE = 0x02
+_SUSPECT = 0x04
+# Fault reasons from cloud.fault_detection, in spare flag bits
+_FAULT_REASONS = (
+    ("out_of_range", 0x08),
+    ("flatline", 0x10),
+    ("peer_outlier", 0x20),
+    ("step_change", 0x40),
+)
+
+
+def _quantize(value: float) -> int:
+    return int(round(min(max(value, 0.0), 1.0) * SOILING_SCALE))
+
+
+def _le_bytes(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _le_view(buf: memoryview, typecode: str, count: int) -> Sequence:
+    """Column view over the buffer; zero-copy on little-endian hosts"""
+    itemsize = array(typecode).itemsize
+    chunk = buf[:count * itemsize]
+    if _LITTLE_ENDIAN:
+        return chunk.cast(typecode)
+    values = array(typecode, chunk.tobytes())
+    values.byteswap()
+    return values
+
+
+class TelemetryBatch:
+    """
+    Decoded telemetry batch. `node_index` and `soiling_q` are typed views
+    over the payload (uint16), usable directly with numpy.frombuffer.
+    """
+
+    def __init__(self, node_ids: List[str], node_index: Sequence,
+                 base_ms: int, ts_delta_ms: Sequence, soiling_q: Sequence):
+        self.node_ids = node_ids
+        self.node_index = node_index
+        self.base_ms = base_ms
+        self.ts_delta_ms = ts_delta_ms
+        self.soiling_q = soiling_q
+
+    def __len__(self) -> int:
+        return len(self.node_index)
+
+    def timestamps(self) -> array:
+        """Absolute timestamps (seconds) rebuilt from the delta column"""
+        out = array("d", bytes(8 * len(self.ts_delta_ms)))
+        ms = self.base_ms
+        for i, delta in enumerate(self.ts_delta_ms):
+            ms += delta
+            out[i] = ms / TIMESTAMP_RESOLUTION
+        return out
+
+    def soiling(self) -> array:
+        return array("d", (q / SOILING_SCALE for q in self.soiling_q))
+
+    def by_node(self) -> Dict[str, List[float]]:
+        """Readings grouped per node, as consumed by AnalyticsEngine"""
+        grouped: Dict[str, List[float]] = {node_id: [] for node_id in self.node_ids}
+        for idx, q in zip(self.node_index, self.soiling_q):
+            grouped[self.node_ids[idx]].append(q / SOILING_SCALE)
+        return grouped
+
+    def to_records(self) -> List[Tuple[str, float, float]]:
+        return list(zip(
+            (self.node_ids[i] for i in self.node_index),
+            self.timestamps(),
+            self.soiling()
+        ))
+
+
+class AnalysisBatch:
+    """Decoded analytics results; columns are uint16/uint8 views"""
+
+    def __init__(self, node_ids: List[str], base_ms: int, ts_delta_ms: Sequence,
+                 avg_q: Sequence, max_q: Sequence, flags: Sequence):
+        self.node_ids = node_ids
+        self.base_ms = base_ms
+        self.ts_delta_ms = ts_delta_ms
+        self.avg_q = avg_q
+        self.max_q = max_q
+        self.flags = flags
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def to_records(self) -> List[Dict]:
+        results = []
+        ms = self.base_ms
+        for i, node_id in enumerate(self.node_ids):
+            ms += self.ts_delta_ms[i]
+            results.append({
+                'node_id': node_id,
+                'avg_soiling': round(self.avg_q[i] / SOILING_SCALE, 4),
+                'max_soiling': round(self.max_q[i] / SOILING_SCALE, 4),
+                'needs_attention': bool(self.flags[i] & _NEEDS_ATTENTION),
+                'preemptive_recommended': bool(self.flags[i] & _PREEMPTIVE),
+                'suspect': bool(self.flags[i] & _SUSPECT),
+                'fault_reasons': [
+                    reason for reason, bit in _FAULT_REASONS if self.flags[i] & bit
+                ],
+                'timestamp': ms / TIMESTAMP_RESOLUTION
+            })
+        return results
+
+
+# --- ENCODING ---
+def _reason_bits(reasons) -> int:
+    bits = 0
+    for reason, bit in _FAULT_REASONS:
+        if reasons and reason in reasons:
+            bits |= bit
+    return bits
+
+
+def _pack_strings(values: Sequence[str]) -> bytes:
+    parts = []
+    for value in values:
+        raw = value.encode("utf-8")
+        if len(raw) > 255:
+            raise ValueError(f"Node id too long for wire format: {value[:32]}...")
+        parts.append(bytes((len(raw),)) + raw)
+    return b"".join(parts)
+
+
+def _ts_deltas(timestamps: Iterable[float]) -> Tuple[int, array]:
+    ms = [int(round(t * TIMESTAMP_RESOLUTION)) for t in timestamps]
+    base = ms[0] if ms else 0
+    deltas = array("i", bytes(4 * len(ms)))
+    prev = base
+    for i, value in enumerate(ms):
+        deltas[i] = value - prev
+        prev = value
+    return base, deltas
+
+
+def _frame(kind: int, count: int, node_ids: Sequence[str], base_ms: int,
+           body: bytes, compress: bool) -> bytes:
+    if len(node_ids) > 0xFFFF:
+        raise ValueError("Too many nodes for a single batch")
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_COMPRESSED
+    header = _HEADER.pack(MAGIC, VERSION, kind, flags, count, len(node_ids), base_ms)
+    return header + body
+
+
+def encode_telemetry(records: Iterable[Tuple[str, float, float]],
+                     compress: bool = False) -> bytes:
+    """
+    Encode (node_id, timestamp, soiling) records as packed columns:
+    node table, uint16 node index, int32 ms timestamp deltas, uint16 soiling.
+    """
+    records = list(records)
+    node_table: Dict[str, int] = {}
+    node_index = array("H")
+    soiling = array("H")
+    for node_id, _, value in records:
+        node_index.append(node_table.setdefault(node_id, len(node_table)))
+        soiling.append(_quantize(value))
+
+    base_ms, deltas = _ts_deltas(r[1] for r in records)
+    node_ids = list(node_table)
+    body = b"".join((
+        _pack_strings(node_ids),
+        _le_bytes(deltas),
+        _le_bytes(node_index),
+        _le_bytes(soiling)
+    ))
+    return _frame(KIND_TELEMETRY, len(records), node_ids, base_ms, body, compress)
+
+
+def encode_analysis(results: Sequence[Dict], compress: bool = False) -> bytes:
+    """Encode analyze_node_data results; error entries are skipped"""
+    results = [r for r in results if 'error' not in r]
+    node_ids = [r['node_id'] for r in results]
+    avg_q = array("H", (_quantize(r['avg_soiling']) for r in results))
+    max_q = array("H", (_quantize(r['max_soiling']) for r in results))
+    flags = array("B", (
+        (_NEEDS_ATTENTION if r['needs_attention'] else 0)
+        | (_PREEMPTIVE if r['preemptive_recommended'] else 0)
+        | (_SUSPECT if r.get('suspect') else 0)
+        | _reason_bits(r.get('fault_reasons'))
+        for r in results
+    ))
+
+    base_ms, deltas = _ts_deltas(r['timestamp'] for r in results)
+    body = b"".join((
+        _pack_strings(node_ids),
+        _le_bytes(deltas),
+        _le_bytes(avg_q),
+        _le_bytes(max_q),
+        flags.tobytes()
+    ))
+    return _frame(KIND_ANALYSIS, len(results), node_ids, base_ms, body, compress)
+
+
+def encode_json(records: Union[Sequence[Tuple[str, float, float]], Sequence[Dict]]) -> bytes:
+    """JSON fallback encoding for consumers without binary support"""
+    if records and not isinstance(records[0], dict):
+        records = [
+            {'node_id': n, 'timestamp': t, 'soiling': v} for n, t, v in records
+        ]
+    return json.dumps(list(records), separators=(",", ":")).encode("utf-8")
+
+
+def encode(records, kind: int = KIND_TELEMETRY,
+           compress: bool = False) -> Tuple[bytes, str]:
+    """Encode using the configured WIRE_FORMAT; returns (payload, content type)"""
+    if WIRE_FORMAT == "json":
+        return encode_json(records), JSON_CONTENT_TYPE
+    if kind == KIND_ANALYSIS:
+        return encode_analysis(records, compress), BINARY_CONTENT_TYPE
+    return encode_telemetry(records, compress), BINARY_CONTENT_TYPE
+
+
+# --- DECODING ---
+def _unpack_strings(buf: memoryview, count: int) -> Tuple[List[str], int]:
+    values, offset = [], 0
+    for _ in range(count):
+        if offset >= len(buf) or offset + 1 + buf[offset] > len(buf):
+            raise ValueError("Truncated batch body")
+        length = buf[offset]
+        values.append(bytes(buf[offset + 1:offset + 1 + length]).decode("utf-8"))
+        offset += 1 + length
+    return values, offset
+
+
+def decode(payload: Union[bytes, bytearray, memoryview]):
+    """
+    Decode a binary batch into a TelemetryBatch/AnalysisBatch. Payloads that
+    do not carry the binary magic are parsed as the JSON fallback.
+    """
+    view = memoryview(payload)
+    if bytes(view[:3]) != MAGIC:
+        return json.loads(bytes(view).decode("utf-8"))
+
+    if len(view) < _HEADER.size:
+        raise ValueError("Truncated batch header")
+    _, version, kind, flags, count, node_count, base_ms = _HEADER.unpack_from(view)
+    if version != VERSION:
+        raise ValueError(f"Unsupported wire format version: {version}")
+
+    if kind not in _RECORD_BYTES:
+        raise ValueError(f"Unknown batch kind: {kind}")
+
+    body = view[_HEADER.size:]
+    if flags & FLAG_COMPRESSED:
+        try:
+            body = memoryview(zlib.decompress(body))
+        except zlib.error as e:
+            raise ValueError(f"Corrupt batch body: {e}") from e
+
+    # Check every column fits before building views over them
+    node_ids, offset = _unpack_strings(body, node_count)
+    if len(body) < offset + _RECORD_BYTES[kind] * count:
+        raise ValueError("Truncated batch body")
+    deltas = _le_view(body[offset:], "i", count)
+    offset += 4 * count
+
+    if kind == KIND_TELEMETRY:
+        node_index = _le_view(body[offset:], "H", count)
+        offset += 2 * count
+        soiling = _le_view(body[offset:], "H", count)
+        return TelemetryBatch(node_ids, node_index, base_ms, deltas, soiling)
+
+    if kind == KIND_ANALYSIS:
+        avg_q = _le_view(body[offset:], "H", count)
+        offset += 2 * count
+        max_q = _le_view(body[offset:], "H", count)
+        offset += 2 * count
+        flags_col = body[offset:offset + count]
+        return AnalysisBatch(node_ids, base_ms, deltas, avg_q, max_q, flags_col)
+
+    raise ValueError(f"Unknown batch kind: {kind}")
@@ -0,0 +1,8 @@
+# tests/conftest.py
+# Modules import each other from the repository root (see net/readme.md)
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
@@ -0,0 +1,91 @@
+# tests/test_circuit_breaker.py
+import pytest
+
+from net.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=3, reset_timeout=10, clock=clock)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_single_probe(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 9.9
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 10.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_probe_success_closes(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10.0
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_probe_failure_reopens_for_full_timeout(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 19.9
+    assert not breaker.allow_request()
+    clock.now = 20.0
+    assert breaker.allow_request()
+
+
+def test_call_fails_fast_while_open(breaker):
+    def boom():
+        raise ConnectionError("down")
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            breaker.call(boom)
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(calls.append, 1)
+    assert calls == []
+
+
+def test_rejects_non_positive_threshold():
+    with pytest.raises(ValueError):
+        CircuitBreaker("bad", failure_threshold=0)
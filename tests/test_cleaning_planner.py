@@ -0,0 +1,104 @@
+# tests/test_cleaning_planner.py
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "predictive-maintenance"))
+
+from cleaning_planner import (  # noqa: E402
+    MAX_DEFER_HOURS, SLOT_SECONDS, CleaningPlanner
+)
+
+T0 = 1_700_000_000 - 1_700_000_000 % SLOT_SECONDS
+
+
+def hour(h: float) -> float:
+    return T0 + h * SLOT_SECONDS
+
+
+def test_undecided_without_forecast():
+    planner = CleaningPlanner(threshold=0.7)
+    for h in range(3):
+        planner.observe("n", 0.95, hour(h))
+        assert planner.is_due("n", hour(h)) is None
+
+
+def test_undecided_past_forecast_horizon():
+    planner = CleaningPlanner(threshold=0.7)
+    planner.update_forecast([0.0] * 24, hour(0))
+    planner.observe("n", 0.95, hour(0))
+    assert planner.is_due("n", hour(0)) is True
+    planner.observe("n", 0.95, hour(24))
+    assert planner.is_due("n", hour(24)) is None
+
+
+def test_clean_node_is_not_due():
+    planner = CleaningPlanner(threshold=0.7)
+    planner.update_forecast([0.0] * 24, hour(0))
+    planner.observe("n", 0.2, hour(0))
+    assert planner.is_due("n", hour(0)) is False
+
+
+def test_waits_out_forecast_dust_event():
+    planner = CleaningPlanner(threshold=0.7)
+    planner.update_forecast([0.0, 1.0, 1.0, 1.0] + [0.0] * 20, hour(0))
+    planner.update_node("n", 0.72, 0.0, hour(0))
+    assert planner.is_due("n", hour(0)) is False
+    assert planner.next_cleaning("n") >= hour(3)
+
+
+def test_deferral_is_capped():
+    planner = CleaningPlanner(threshold=0.7)
+    planner.update_forecast([1.0] * 48, hour(0))
+    planner.observe("n", 0.8, hour(0))
+    planner.observe("n", 0.8, hour(MAX_DEFER_HOURS))
+    assert planner.is_due("n", hour(MAX_DEFER_HOURS)) is True
+
+
+def test_no_capacity_falls_back_to_threshold():
+    planner = CleaningPlanner(threshold=0.7, capacity=1)
+    planner.update_forecast([0.0], hour(0))
+    planner.observe("a", 0.9, hour(0))
+    planner.observe("b", 0.9, hour(0))
+    assert sorted([planner.is_due("a", hour(0)), planner.is_due("b", hour(0))],
+                  key=str) == [None, True]
+
+
+def test_poll_noise_does_not_flip_decision():
+    rng = random.Random(1)
+    planner = CleaningPlanner(threshold=0.7)
+    planner.update_forecast([0.0] * 24, hour(0))
+    decisions = set()
+    for step in range(6 * 360):  # 6 hours of 10 s polls
+        now = hour(0) + step * 10
+        planner.observe("n", 0.65 + rng.uniform(-0.01, 0.01), now)
+        decisions.add(planner.is_due("n", now))
+    assert decisions == {False}
+
+
+def test_mark_cleaned_resets_node():
+    planner = CleaningPlanner(threshold=0.7)
+    planner.update_forecast([0.0] * 24, hour(0))
+    planner.observe("n", 0.9, hour(0))
+    planner.mark_cleaned("n", hour(0))
+    assert planner.is_due("n", hour(0)) is False
+
+
+def test_cleaning_does_not_invent_a_trend():
+    planner = CleaningPlanner(threshold=0.7)
+    planner.update_forecast([0.0] * 24, hour(0))
+    planner.observe("n", 0.3, hour(0))
+    planner.mark_cleaned("n", hour(0))
+    for h in range(1, 24):
+        planner.observe("n", 0.3, hour(h))
+    assert planner.next_cleaning("n") is None
+
+
+def test_decide_applies_edge_trigger_rule():
+    planner = CleaningPlanner(threshold=0.7)
+    assert planner.decide("n", 0.95, hour(0)) == "soiling"    # No forecast
+    assert planner.decide("m", 0.5, hour(0)) is None
+    planner.update_forecast([0.0] * 24, hour(0))
+    assert planner.decide("n", 0.95, hour(0)) == "predictive"
+    assert planner.decide("m", 0.5, hour(0)) is None
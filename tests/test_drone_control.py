@@ -0,0 +1,43 @@
+# tests/test_drone_control.py
+import pytest
+
+from drone_control import drone_control
+
+COORDS = {"p1": (3.0, 0.0), "p2": (3.0, 2.0)}
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    """Records every Tello command; the drone answers "ok" to all of them"""
+    sent = []
+
+    def send_command(command, delay=3):
+        sent.append(command)
+        return "ok"
+
+    monkeypatch.setattr(drone_control, "send_command", send_command)
+    monkeypatch.setattr(drone_control, "CLEANING_DURATION", 0)
+    monkeypatch.setattr(drone_control.state_receiver, "start", lambda: None)
+    monkeypatch.setattr(drone_control.state_receiver, "battery", lambda: 90.0)
+    return sent
+
+
+def test_route_mission_returns_to_pad(commands):
+    assert drone_control.start_route_mission(["p1", "p2"], COORDS) == "mission_success"
+    assert commands[:2] == ["command", "takeoff"]
+    assert commands[-1] == "land"
+
+
+def test_failed_return_is_not_success(commands, monkeypatch):
+    monkeypatch.setattr(
+        drone_control, "_fly_to", lambda here, target: target != drone_control.ORIGIN
+    )
+    assert drone_control.start_route_mission(["p1"], COORDS) == "return_failure"
+    assert commands[-1] == "land"
+
+
+def test_low_battery_blocks_takeoff(commands, monkeypatch):
+    monkeypatch.setattr(drone_control.state_receiver, "battery", lambda: 10.0)
+    assert drone_control.start_mission() == "low_battery"
+    assert drone_control.start_route_mission(["p1"], COORDS) == "low_battery"
+    assert "takeoff" not in commands
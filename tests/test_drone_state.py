@@ -0,0 +1,73 @@
+# tests/test_drone_state.py
+import pytest
+
+from drone_control import drone_state
+from drone_control.drone_state import DroneStateReceiver, StateRing, parse_state
+
+PACKET = (b"mid:-1;x:0;y:0;z:0;mpry:0,0,0;pitch:1;roll:-2;yaw:45;vgx:0;vgy:0;vgz:0;"
+          b"templ:60;temph:62;tof:35;h:120;bat:87;baro:12.34;time:9;agx:1.0;agy:2.0;agz:-999.0;\r\n")
+
+
+def test_parse_state_keeps_known_fields():
+    state = parse_state(PACKET)
+    assert state["bat"] == 87.0
+    assert state["h"] == 120.0
+    assert state["baro"] == pytest.approx(12.34)
+    assert state["roll"] == -2.0
+    assert set(state) == set(drone_state.FIELDS)
+
+
+def test_parse_state_skips_malformed_items():
+    assert parse_state(b"bat:low;h:50;junk;:3;yaw\r\n") == {"h": 50.0}
+    assert parse_state(b"") == {}
+    assert parse_state(b"\xff\xfebat:12;") == {"bat": 12.0}
+
+
+def test_ring_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        StateRing(0)
+
+
+def test_ring_latest_tracks_sequence():
+    ring = StateRing(4)
+    assert ring.latest is None
+    ring.append({"bat": 90.0}, 100.0)
+    ring.append({"bat": 89.0}, 101.0)
+    assert ring.latest == {"bat": 89.0, "received_at": 101.0, "seq": 2}
+
+
+def test_ring_history_before_wrap():
+    ring = StateRing(4)
+    for i in range(3):
+        ring.append({"bat": 90.0 - i}, 100.0 + i)
+    history = ring.history(10)
+    assert [s["bat"] for s in history] == [90.0, 89.0, 88.0]
+    assert [s["received_at"] for s in history] == [100.0, 101.0, 102.0]
+    assert history[0]["h"] == 0.0  # Missing fields read as zero
+
+
+def test_ring_history_after_wrap():
+    ring = StateRing(4)
+    for i in range(10):
+        ring.append({"bat": float(i), "h": 10.0 * i}, 100.0 + i)
+    assert ring.count == 10
+    assert ring.latest["seq"] == 10
+    # Oldest first, only the last `capacity` samples survive
+    assert [s["bat"] for s in ring.history(10)] == [6.0, 7.0, 8.0, 9.0]
+    assert [s["received_at"] for s in ring.history(2)] == [108.0, 109.0]
+    assert ring.history(0) == []
+
+
+def test_latest_goes_stale(monkeypatch):
+    receiver = DroneStateReceiver(capacity=4)
+    now = [1000.0]
+    monkeypatch.setattr(drone_state.time, "time", lambda: now[0])
+    assert receiver.latest() is None
+    assert receiver.battery() is None
+
+    receiver.ring.append({"bat": 55.0}, 1000.0)
+    now[0] += drone_state.STATE_STALE_AFTER
+    assert receiver.battery() == 55.0
+    now[0] += 0.01
+    assert receiver.latest() is None
+    assert receiver.battery() is None
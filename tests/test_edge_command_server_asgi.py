@@ -0,0 +1,166 @@
+# tests/test_edge_command_server_asgi.py
+import asyncio
+import time
+
+import pytest
+
+jwt = pytest.importorskip("jwt")
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+
+from starlette.testclient import TestClient  # noqa: E402
+
+from server import edge_command_server_asgi as server  # noqa: E402
+from server.rate_limit import RateLimiter  # noqa: E402
+
+SECRET = "edge-node-test-secret-0123456789abcdef"
+
+
+def token(**overrides) -> str:
+    claims = {
+        "iss": "air4life-auth",
+        "aud": "edge-node",
+        "exp": int(time.time()) + 60,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, SECRET, algorithm="HS256")
+
+
+def auth(**overrides) -> dict:
+    return {"Authorization": f"Bearer {token(**overrides)}"}
+
+
+class StubTracker(server.MissionTracker):
+    """Runs missions with a canned result instead of flying the drone"""
+
+    def __init__(self, result="mission_success"):
+        super().__init__()
+        self.result = result
+        self.runs = 0
+
+    def job(self, on_progress=None):
+        self.runs += 1
+        return self.result
+
+    async def run(self, mission, job=None):
+        return await super().run(mission, self.job)
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET_KEY", SECRET)
+    monkeypatch.setattr(server, "limiter", RateLimiter())
+    tracker = StubTracker()
+    monkeypatch.setattr(server, "missions", tracker)
+    return tracker
+
+
+@pytest.fixture
+def client(tracker):
+    # No context manager: startup would bind the drone state socket
+    return TestClient(server.app)
+
+
+def test_security_headers_carry_fresh_nonce(client):
+    nonces = []
+    for _ in range(2):
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.headers["x-frame-options"] == "SAMEORIGIN"
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert response.headers["permissions-policy"] == server.PERMISSIONS_POLICY
+        assert "strict-transport-security" not in response.headers
+        csp = response.headers["content-security-policy"]
+        script_src = next(d for d in csp.split("; ") if d.startswith("script-src"))
+        nonces.append(script_src.rsplit("'nonce-", 1)[1].rstrip("'"))
+    assert nonces[0] != nonces[1]
+    assert all(len(nonce) == 32 for nonce in nonces)
+
+
+def test_https_requests_get_hsts(client):
+    response = client.get("https://testserver/health")
+    assert "max-age=31536000" in response.headers["strict-transport-security"]
+
+
+def test_start_mission_requires_json(client, tracker):
+    response = client.post("/start_mission", content=b"go", headers=auth())
+    assert response.status_code == 415
+    assert response.json()["code"] == "INVALID_CONTENT_TYPE"
+    assert tracker.runs == 0
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"Authorization": "Bearer not-a-jwt"},
+    {"Authorization": f"Bearer {token(exp=int(time.time()) - 10)}"},
+    {"Authorization": f"Bearer {token(aud='someone-else')}"},
+])
+def test_start_mission_requires_valid_jwt(client, tracker, headers):
+    response = client.post("/start_mission", json={}, headers=headers)
+    assert response.status_code == 401
+    assert response.json()["code"] == "UNAUTHORIZED"
+    assert tracker.runs == 0
+
+
+def test_start_mission_runs_job(client, tracker):
+    response = client.post("/start_mission", json={}, headers=auth())
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "message": "mission_success"}
+    assert tracker.runs == 1
+
+
+def test_failed_mission_is_500(client, tracker):
+    tracker.result = "takeoff_failure"
+    response = client.post("/start_mission", json={}, headers=auth())
+    assert response.status_code == 500
+    assert response.json()["message"] == "takeoff_failure"
+
+
+def test_start_mission_is_rate_limited(client, tracker):
+    statuses = [
+        client.post("/start_mission", json={}, headers=auth()).status_code
+        for _ in range(11)
+    ]
+    assert statuses == [200] * 10 + [429]
+    assert tracker.runs == 10
+
+
+def test_mission_events_stream_until_terminal(client, tracker):
+    mission = tracker.submit()
+    mission.update(status="success", result="mission_success")
+    response = client.get(f"/missions/{mission.id}/events", headers=auth())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.count("event: status") == 1
+    assert '"status": "success"' in response.text
+
+
+def test_wait_change_wakes_on_update():
+    async def run():
+        mission = server.Mission()
+        seen = mission.version
+        waiters = [asyncio.create_task(mission.wait_change(seen, 5)) for _ in range(3)]
+        await asyncio.sleep(0)
+        mission.update(status="running", phase="takeoff")
+        return mission, await asyncio.gather(*waiters)
+
+    mission, woken = asyncio.run(run())
+    assert woken == [True, True, True]
+    assert mission.version == 1
+
+
+def test_wait_change_times_out_without_update():
+    async def run():
+        mission = server.Mission()
+        return await mission.wait_change(mission.version, 0.01)
+
+    assert asyncio.run(run()) is False
+
+
+def test_wait_change_returns_at_once_if_already_changed():
+    async def run():
+        mission = server.Mission()
+        mission.update(status="running")
+        return await asyncio.wait_for(mission.wait_change(0, 5), 0.5)
+
+    assert asyncio.run(run()) is True
@@ -0,0 +1,56 @@
+# tests/test_fault_detection.py
+import random
+
+from cloud.fault_detection import FLATLINE_MIN_READINGS, FaultDetector, is_blocking
+
+
+def site_batch(rng, dirty_level=None, stuck=None):
+    batch = {f"peer_{i}": [0.4 + rng.uniform(-0.02, 0.02) for _ in range(12)]
+             for i in range(10)}
+    if dirty_level is not None:
+        batch["dirty"] = [dirty_level + rng.uniform(-0.05, 0.05) for _ in range(12)]
+    if stuck is not None:
+        batch["stuck"] = [stuck] * 12
+    return batch
+
+
+def test_is_blocking():
+    assert not is_blocking(None)
+    assert not is_blocking([])
+    assert not is_blocking(["peer_outlier", "step_change"])
+    assert is_blocking(["peer_outlier", "flatline"])
+    assert is_blocking(["out_of_range"])
+
+
+def test_dirty_panel_is_never_blocked():
+    rng = random.Random(0)
+    detector = FaultDetector()
+    for step in range(8):
+        level = min(0.4 + 0.1 * step, 0.85)
+        faults = detector.update(site_batch(rng, dirty_level=level))
+        assert not is_blocking(faults.get("dirty"))
+
+
+def test_step_change_clears_once_baseline_catches_up():
+    rng = random.Random(1)
+    detector = FaultDetector()
+    detector.update(site_batch(rng, dirty_level=0.4))
+    assert "step_change" in detector.update(site_batch(rng, dirty_level=0.8)).get("dirty", [])
+    for _ in range(10):
+        faults = detector.update(site_batch(rng, dirty_level=0.8))
+    assert "step_change" not in faults.get("dirty", [])
+
+
+def test_stuck_sensor_is_blocked():
+    rng = random.Random(2)
+    detector = FaultDetector()
+    batches = -(-FLATLINE_MIN_READINGS // 12)
+    for _ in range(batches):
+        faults = detector.update(site_batch(rng, stuck=0.4))
+    assert "flatline" in faults["stuck"]
+    assert is_blocking(faults["stuck"])
+
+
+def test_out_of_range_is_blocked():
+    faults = FaultDetector().update({"broken": [0.5, 1.4, 0.5]})
+    assert faults["broken"] == ["out_of_range"]
@@ -0,0 +1,49 @@
+# tests/test_fleet_simulator.py
+# Regression baseline for the seeded fleet simulation. A change to the
+# planner, fault detection or batching that moves these numbers must update
+# them deliberately.
+import os
+import logging
+
+import pytest
+
+SCENARIO = dict(
+    nodes=100, sites=5, hours=6, seed=7, drones_per_site=2,
+    poll_interval=600, analysis_interval=3600,
+    faulty_fraction=0.02, batch_window=300
+)
+
+
+@pytest.fixture(scope="module")
+def fleet_simulator(tmp_path_factory):
+    # analytics opens analytics.log in the working directory on import
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("simulation"))
+    try:
+        from simulation import fleet_simulator
+    finally:
+        os.chdir(cwd)
+    logging.getLogger("Cleaning Planner").setLevel(logging.ERROR)
+    return fleet_simulator
+
+
+@pytest.mark.parametrize("mode", ["planner", "reactive"])
+def test_same_seed_same_digest(fleet_simulator, mode):
+    first = fleet_simulator.run_simulation(mode=mode, **SCENARIO)
+    second = fleet_simulator.run_simulation(mode=mode, **SCENARIO)
+    assert first["digest"] == second["digest"]
+
+
+@pytest.mark.parametrize("mode, missions, flights", [
+    ("planner", 38, 33),
+    ("reactive", 59, 54),
+])
+def test_mission_counts(fleet_simulator, mode, missions, flights):
+    result = fleet_simulator.run_simulation(mode=mode, **SCENARIO)
+    assert (result["missions"], result["flights"]) == (missions, flights)
+
+
+def test_seed_changes_digest(fleet_simulator):
+    base = fleet_simulator.run_simulation(**SCENARIO)
+    reseeded = fleet_simulator.run_simulation(**dict(SCENARIO, seed=8))
+    assert base["digest"] != reseeded["digest"]
@@ -0,0 +1,101 @@
+# tests/test_forecast_source.py
+import os
+import sys
+import time
+
+import pytest
+
+# copernicus_fetcher pulls in the pooled HTTP client
+pytest.importorskip("requests")
+pytest.importorskip("tenacity")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "predictive-maintenance"))
+
+from copernicus_fetcher import ForecastSource, get_fallback_forecast  # noqa: E402
+from net.circuit_breaker import CircuitBreaker  # noqa: E402
+
+
+class FlakyFetch:
+    def __init__(self):
+        self.calls = 0
+        self.failing = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.failing:
+            raise ConnectionError("CAMS down")
+        return {"dust_storm_risk": 0.5, "timestamp": f"t{self.calls}"}
+
+
+def make_source(fetch, **kwargs):
+    options = dict(max_age=0.05, stale_after=0.5, retry_delay=0.2,
+                   breaker=CircuitBreaker("test", failure_threshold=100))
+    options.update(kwargs)
+    return ForecastSource("test", fetch, get_fallback_forecast, **options)
+
+
+def settle(source):
+    """Wait for an in-flight background refresh"""
+    deadline = time.monotonic() + 2
+    while source._refreshing and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_serves_last_good_while_cams_fails():
+    fetch = FlakyFetch()
+    source = make_source(fetch)
+    assert source.get(wait=2)["dust_storm_risk"] == 0.5
+    fetch.failing = True
+    time.sleep(0.06)
+    source.get()
+    settle(source)
+    forecast = source.get()
+    assert forecast["timestamp"] == "t1"
+    assert not forecast.get("simulated")
+
+
+def test_failed_refresh_waits_retry_delay():
+    fetch = FlakyFetch()
+    fetch.failing = True
+    source = make_source(fetch)
+    for _ in range(10):
+        source.get()
+        settle(source)
+    assert fetch.calls == 1
+    time.sleep(0.21)
+    source.get()
+    settle(source)
+    assert fetch.calls == 2
+
+
+def test_expired_forecast_falls_back_to_simulated():
+    fetch = FlakyFetch()
+    source = make_source(fetch, stale_after=0.1)
+    assert not source.get(wait=2).get("simulated")
+    fetch.failing = True
+    time.sleep(0.12)
+    assert source.get()["simulated"] is True
+
+
+def test_series_without_fallback_expires_to_none():
+    fetch = FlakyFetch()
+    source = ForecastSource("series", fetch, max_age=0.05, stale_after=0.1,
+                            retry_delay=10, breaker=CircuitBreaker("series"))
+    assert source.get(wait=2) is not None
+    fetch.failing = True
+    time.sleep(0.12)
+    assert source.get() is None
+
+
+def test_open_breaker_stops_refreshes():
+    fetch = FlakyFetch()
+    fetch.failing = True
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+    source = make_source(fetch, retry_delay=0, breaker=breaker)
+    source.get()
+    settle(source)
+    assert breaker.state == CircuitBreaker.OPEN
+    for _ in range(5):
+        assert source.get()["breaker_state"] == CircuitBreaker.OPEN
+    assert fetch.calls == 1
@@ -0,0 +1,117 @@
+# tests/test_http_client.py
+import pytest
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("tenacity")
+
+from net.circuit_breaker import CircuitBreaker, CircuitOpenError  # noqa: E402
+from net.http_client import (  # noqa: E402
+    HostPolicy, HttpClient, HttpStatusError, TransportError
+)
+
+HOST = "example.test"
+URL = f"http://{HOST}/path"
+FAST = HostPolicy(attempts=3, backoff_min=0, backoff_max=0,
+                  breaker_failures=2, breaker_reset=60)
+
+
+class ScriptedSession(requests.Session):
+    """Answers each request with the next status code or raises the next exception"""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        step = self.script.pop(0)
+        if isinstance(step, BaseException):
+            raise step
+        response = requests.Response()
+        response.status_code = step
+        response._content = b"{}"
+        response.url = url
+        return response
+
+
+def make_client(script, policy=FAST):
+    client = HttpClient(http2=False)
+    client.register_policy(HOST, policy)
+    session = ScriptedSession(script)
+    client._sessions[f"http://{HOST}"] = session
+    return client, session
+
+
+def test_success_passes_response_through():
+    client, session = make_client([200])
+    assert client.get(URL).status_code == 200
+    assert session.calls == 1
+
+
+@pytest.mark.parametrize("status", [429, 502, 503, 504])
+def test_retryable_statuses_are_retried(status):
+    client, session = make_client([status, status, 200])
+    assert client.get(URL).status_code == 200
+    assert session.calls == 3
+    assert client.breaker(HOST).state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 500])
+def test_other_statuses_are_not_retried(status):
+    client, session = make_client([status, 200])
+    with pytest.raises(HttpStatusError) as excinfo:
+        client.get(URL)
+    assert excinfo.value.status_code == status
+    assert session.calls == 1
+
+
+def test_transport_errors_are_retried():
+    client, session = make_client([requests.ConnectionError("reset"), 200])
+    assert client.get(URL).status_code == 200
+    assert session.calls == 2
+
+
+def test_client_errors_do_not_trip_breaker():
+    client, _ = make_client([404] * 5)
+    for _ in range(5):
+        with pytest.raises(HttpStatusError):
+            client.get(URL)
+    assert client.breaker(HOST).state == CircuitBreaker.CLOSED
+
+
+def test_server_errors_trip_breaker():
+    client, session = make_client([500, 500])
+    for _ in range(2):
+        with pytest.raises(HttpStatusError):
+            client.get(URL)
+    assert client.breaker(HOST).state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        client.get(URL)
+    assert session.calls == 2
+
+
+def test_exhausted_transport_retries_raise_transport_error():
+    client, session = make_client([requests.Timeout("slow")] * 3)
+    with pytest.raises(TransportError):
+        client.get(URL)
+    assert session.calls == 3
+
+
+@pytest.mark.parametrize("error", [ValueError("bad body"), TransportError("down")])
+def test_failed_probe_releases_half_open_circuit(error):
+    policy = FAST._replace(attempts=1, breaker_failures=1, breaker_reset=0.05)
+    client, _ = make_client([500, error, 200], policy)
+    breaker = client.breaker(HOST)
+    with pytest.raises(HttpStatusError):
+        client.get(URL)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker.reset_timeout = 0
+    with pytest.raises(type(error)):
+        client.get(URL)  # Probe fails with an unexpected exception
+    assert breaker.state in (CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN)
+    assert not breaker._probe_in_flight
+
+    assert client.get(URL).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
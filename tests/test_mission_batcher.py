@@ -0,0 +1,80 @@
+# tests/test_mission_batcher.py
+import itertools
+
+import pytest
+
+from drone_control.mission_batcher import (
+    MAX_FLIGHT_SECONDS, flight_budget, flight_seconds, nearest_neighbor,
+    plan_flights, plan_route, split_flights, tour_length, two_opt
+)
+
+# Two rows of panels either side of the launch pad
+LAYOUT = {
+    "a1": (10.0, 10.0), "a2": (20.0, 10.0), "a3": (30.0, 10.0), "a4": (40.0, 10.0),
+    "b1": (10.0, -10.0), "b2": (20.0, -10.0), "b3": (30.0, -10.0), "b4": (40.0, -10.0),
+}
+
+
+def best_tour(panels, coords):
+    return min(tour_length(p, coords) for p in itertools.permutations(panels))
+
+
+def test_tour_length_is_closed():
+    assert tour_length(["a1"], {"a1": (3.0, 4.0)}) == pytest.approx(10.0)
+    assert tour_length([], LAYOUT) == 0.0
+
+
+def test_nearest_neighbor_visits_each_panel_once():
+    route = nearest_neighbor(sorted(LAYOUT), LAYOUT)
+    assert sorted(route) == sorted(LAYOUT)
+    assert route[0] in ("a1", "b1")
+
+
+def test_two_opt_never_lengthens_route():
+    crossed = ["a1", "b2", "a3", "b4", "a4", "b3", "a2", "b1"]
+    improved = two_opt(crossed, LAYOUT)
+    assert sorted(improved) == sorted(crossed)
+    assert tour_length(improved, LAYOUT) < tour_length(crossed, LAYOUT)
+
+
+def test_plan_route_is_optimal_on_small_layout():
+    panels = ["a1", "a3", "b2", "b4", "a4"]
+    route = plan_route(panels, LAYOUT)
+    assert tour_length(route, LAYOUT) == pytest.approx(best_tour(panels, LAYOUT))
+
+
+def test_plan_route_is_deterministic_and_deduplicated():
+    panels = ["b4", "a1", "a1", "b2", "a3"]
+    assert plan_route(panels, LAYOUT) == plan_route(list(reversed(panels)), LAYOUT)
+    assert len(plan_route(panels, LAYOUT)) == 4
+
+
+def test_split_flights_respects_budget():
+    route = plan_route(sorted(LAYOUT), LAYOUT)
+    budget = flight_seconds(route[:3], LAYOUT) + 1
+    flights = split_flights(route, LAYOUT, budget)
+    assert [p for flight in flights for p in flight] == route
+    assert len(flights) > 1
+    assert all(flight_seconds(f, LAYOUT) <= budget for f in flights if len(f) > 1)
+
+
+def test_single_stop_always_gets_a_flight():
+    assert split_flights(["a4"], LAYOUT, budget=1.0) == [["a4"]]
+
+
+def test_plan_flights_covers_every_panel():
+    budget = flight_seconds(["a1", "a2"], LAYOUT) + 1
+    flights = plan_flights(sorted(LAYOUT), LAYOUT, budget)
+    assert sorted(p for flight in flights for p in flight) == sorted(LAYOUT)
+    assert all(flight_seconds(f, LAYOUT) <= budget for f in flights if len(f) > 1)
+
+
+def test_plan_flights_rejects_unknown_panels():
+    with pytest.raises(ValueError, match="zz"):
+        plan_flights(["a1", "zz"], LAYOUT, MAX_FLIGHT_SECONDS)
+
+
+def test_flight_budget():
+    assert flight_budget(None, 15) == MAX_FLIGHT_SECONDS
+    assert flight_budget(10, 15) == 0.0
+    assert flight_budget(20, 15) < flight_budget(40, 15) <= MAX_FLIGHT_SECONDS
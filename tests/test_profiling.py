@@ -0,0 +1,133 @@
+# tests/test_profiling.py
+import logging
+import os
+import threading
+import time
+
+import pytest
+
+from instrumentation import profiling
+from instrumentation.profiling import CycleProfiler, SamplingProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(profiling.time, "perf_counter", clock)
+    return clock
+
+
+def test_stage_breakdown(clock, caplog):
+    profiler = CycleProfiler("edge", budget=10)
+    with caplog.at_level(logging.DEBUG, logger="Profiling"):
+        with profiler.cycle("1"):
+            with profiler.stage("sensor_read"):
+                clock.advance(0.25)
+            with profiler.stage("report"):
+                clock.advance(0.5)
+    assert profiler.last_breakdown == [("sensor_read", 0.25), ("report", 0.5)]
+    assert profiler.last_total == pytest.approx(0.75)
+    assert [r.levelname for r in caplog.records] == ["DEBUG"]
+    assert "sensor_read=250.0ms report=500.0ms" in caplog.records[0].getMessage()
+
+
+def test_untimed_work_is_reported_as_other(clock):
+    profiler = CycleProfiler("edge", budget=10)
+    with profiler.cycle():
+        with profiler.stage("predictive"):
+            clock.advance(0.1)
+        clock.advance(0.2)
+    name, duration = profiler.last_breakdown[-1]
+    assert name == "other"
+    assert duration == pytest.approx(0.2)
+
+
+def test_tiny_remainder_is_not_reported(clock):
+    profiler = CycleProfiler("edge", budget=10)
+    with profiler.cycle():
+        with profiler.stage("predictive"):
+            clock.advance(0.1)
+        clock.advance(0.0001)
+    assert [name for name, _ in profiler.last_breakdown] == ["predictive"]
+
+
+def test_overrun_logs_warning(clock, caplog):
+    profiler = CycleProfiler("analytics", budget=1.0)
+    with caplog.at_level(logging.WARNING, logger="Profiling"):
+        with profiler.cycle("42"):
+            with profiler.stage("fetch"):
+                clock.advance(1.5)
+    [record] = caplog.records
+    assert record.levelname == "WARNING"
+    message = record.getMessage()
+    assert message.startswith("analytics cycle 42 overran 1.0s budget: 1.500s")
+    assert "fetch=1500.0ms" in message
+
+
+def test_warning_goes_to_given_logger(clock, caplog):
+    profiler = CycleProfiler("edge", budget=0.1, log=logging.getLogger("EdgeNode"))
+    with caplog.at_level(logging.WARNING):
+        with profiler.cycle():
+            clock.advance(0.2)
+    assert [r.name for r in caplog.records] == ["EdgeNode"]
+
+
+def test_stage_outside_cycle_is_not_recorded(clock):
+    profiler = CycleProfiler("edge", budget=10)
+    with profiler.stage("report"):
+        clock.advance(0.1)
+    assert profiler.last_breakdown == []
+
+
+def test_dump_writes_collapsed_stacks(tmp_path):
+    profiler = SamplingProfiler("edge", hz=10, out_dir=str(tmp_path / "profiles"))
+    profiler._samples.update({
+        "MainThread;main@main.py:1;run@main.py:10": 3,
+        "worker;loop@worker.py:5": 7,
+    })
+    path = profiler.dump()
+    assert os.path.basename(path) == f"edge-{os.getpid()}-0.collapsed"
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    # Most frequent stack first, "<stack> <count>" per line
+    assert lines == [
+        "worker;loop@worker.py:5 7",
+        "MainThread;main@main.py:1;run@main.py:10 3",
+    ]
+
+
+def test_sampled_stacks_name_thread_and_frames(tmp_path):
+    stop = threading.Event()
+
+    def busy_worker():
+        while not stop.is_set():
+            time.sleep(0.001)
+
+    worker = threading.Thread(target=busy_worker, name="busy", daemon=True)
+    worker.start()
+    profiler = SamplingProfiler("sim", hz=200, out_dir=str(tmp_path))
+    profiler.start()
+    time.sleep(0.1)
+    path = profiler.stop()
+    stop.set()
+    worker.join()
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    worker_lines = [line for line in lines if line.startswith("busy;")]
+    assert worker_lines
+    stack, count = worker_lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    line = busy_worker.__code__.co_firstlineno
+    assert stack.endswith(f"busy_worker@test_profiling.py:{line}")
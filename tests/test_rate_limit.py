@@ -0,0 +1,101 @@
+# tests/test_rate_limit.py
+import asyncio
+
+import pytest
+
+from server import rate_limit
+from server.rate_limit import MemoryStorage, RateLimiter, parse_limits
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def hits(limiter, count, limits, key="10.0.0.1"):
+    async def run():
+        return [await limiter.hit("start_mission", key, limits) for _ in range(count)]
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("30/minute", [(30, 60)]),
+    (" 300 / hours ", [(300, 3600)]),
+    ("1/second", [(1, 1)]),
+    ("5/day", [(5, 86400)]),
+])
+def test_parse_limits(spec, expected):
+    assert parse_limits(spec) == expected
+
+
+def test_parse_multiple_limits():
+    assert parse_limits("300/hour", "30/minute") == [(300, 3600), (30, 60)]
+
+
+@pytest.mark.parametrize("spec", ["", "ten/minute", "5/fortnight", "5 per minute"])
+def test_parse_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_limits(spec)
+
+
+def test_limit_allows_up_to_amount(clock):
+    limiter = RateLimiter()
+    assert hits(limiter, 4, parse_limits("3/minute")) == [True, True, True, False]
+
+
+def test_keys_are_counted_separately(clock):
+    limiter = RateLimiter()
+    limits = parse_limits("1/minute")
+    assert hits(limiter, 1, limits, key="a") == [True]
+    assert hits(limiter, 1, limits, key="b") == [True]
+    assert hits(limiter, 1, limits, key="a") == [False]
+
+
+def test_window_expires_after_period(clock):
+    limiter = RateLimiter()
+    limits = parse_limits("2/minute")
+    assert hits(limiter, 3, limits) == [True, True, False]
+    clock.now += 61
+    assert hits(limiter, 1, limits) == [True]
+
+
+def test_expiry_is_elastic(clock):
+    limiter = RateLimiter()
+    limits = parse_limits("2/minute")
+    assert hits(limiter, 3, limits) == [True, True, False]
+    # Every hit, even a rejected one, pushes the expiry out again
+    clock.now += 50
+    assert hits(limiter, 1, limits) == [False]
+    clock.now += 50
+    assert hits(limiter, 1, limits) == [False]
+    clock.now += 61
+    assert hits(limiter, 1, limits) == [True]
+
+
+def test_every_limit_is_enforced(clock):
+    limiter = RateLimiter()
+    limits = parse_limits("3/hour", "2/minute")
+    assert hits(limiter, 3, limits) == [True, True, False]
+    clock.now += 61
+    assert hits(limiter, 2, limits) == [False, False]
+
+
+def test_memory_storage_purges_expired_counters(clock):
+    storage = MemoryStorage()
+
+    async def run():
+        await storage.incr("old", 1)
+        clock.now += 61
+        await storage.incr("new", 60)
+    asyncio.run(run())
+    assert list(storage._counters) == ["new"]
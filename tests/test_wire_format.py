@@ -0,0 +1,129 @@
+# tests/test_wire_format.py
+import json
+
+import pytest
+
+from telemetry.wire_format import (
+    AnalysisBatch, BINARY_CONTENT_TYPE, KIND_ANALYSIS, MAGIC, SOILING_SCALE,
+    TelemetryBatch, decode, encode_analysis, encode_json, encode_telemetry
+)
+
+RECORDS = [
+    ("node_1", 1_700_000_000.0, 0.1234),
+    ("node_2", 1_700_000_010.5, 0.98),
+    ("node_1", 1_700_000_020.25, 0.5),
+    ("nödé_3", 1_700_000_030.0, 0.0),
+]
+
+RESULTS = [
+    {'node_id': "node_1", 'avg_soiling': 0.4321, 'max_soiling': 0.91,
+     'needs_attention': True, 'preemptive_recommended': False, 'suspect': False,
+     'fault_reasons': ["peer_outlier"], 'timestamp': 1_700_000_000.0},
+    {'node_id': "node_2", 'avg_soiling': 0.2, 'max_soiling': 0.3,
+     'needs_attention': False, 'preemptive_recommended': True, 'suspect': True,
+     'fault_reasons': ["out_of_range", "flatline", "step_change"],
+     'timestamp': 1_700_000_060.0},
+    {'node_id': "node_3", 'error': "Empty data batch received", 'timestamp': 0.0},
+]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_telemetry_round_trip(compress):
+    batch = decode(encode_telemetry(RECORDS, compress=compress))
+    assert isinstance(batch, TelemetryBatch)
+    assert len(batch) == len(RECORDS)
+    for (node, ts, value), (d_node, d_ts, d_value) in zip(RECORDS, batch.to_records()):
+        assert d_node == node
+        assert d_ts == pytest.approx(ts, abs=1e-3)
+        assert d_value == pytest.approx(value, abs=1 / SOILING_SCALE)
+    assert batch.by_node()["node_1"] == pytest.approx([0.1234, 0.5])
+
+
+def test_soiling_is_clamped_to_scale():
+    batch = decode(encode_telemetry([("n", 0.0, -0.2), ("n", 1.0, 1.7)]))
+    assert list(batch.soiling()) == [0.0, 1.0]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_analysis_round_trip_skips_errors(compress):
+    batch = decode(encode_analysis(RESULTS, compress=compress))
+    assert isinstance(batch, AnalysisBatch)
+    decoded = batch.to_records()
+    assert [r['node_id'] for r in decoded] == ["node_1", "node_2"]
+    for original, result in zip(RESULTS, decoded):
+        for key in ('needs_attention', 'preemptive_recommended', 'suspect', 'fault_reasons'):
+            assert result[key] == original[key]
+        assert result['avg_soiling'] == pytest.approx(original['avg_soiling'])
+        assert result['timestamp'] == pytest.approx(original['timestamp'])
+
+
+def test_empty_batches():
+    assert len(decode(encode_telemetry([]))) == 0
+    assert len(decode(encode_analysis([]))) == 0
+
+
+def test_json_fallback_is_decoded():
+    payload = encode_json(RECORDS)
+    assert not payload.startswith(MAGIC)
+    assert decode(payload) == json.loads(payload)
+    assert decode(payload)[0] == {'node_id': "node_1", 'timestamp': 1_700_000_000.0,
+                                  'soiling': 0.1234}
+
+
+def test_rejects_unknown_version():
+    payload = bytearray(encode_telemetry(RECORDS))
+    payload[3] = 99
+    with pytest.raises(ValueError, match="version"):
+        decode(bytes(payload))
+
+
+def test_rejects_long_node_ids():
+    with pytest.raises(ValueError):
+        encode_telemetry([("x" * 256, 0.0, 0.5)])
+
+
+def test_binary_is_smaller_than_json():
+    records = [(f"node_{i % 50}", 1_700_000_000.0 + i, (i % 100) / 100) for i in range(5000)]
+    assert len(encode_telemetry(records)) * 4 < len(encode_json(records))
+
+
+def test_encode_reports_content_type(monkeypatch):
+    import telemetry.wire_format as wire_format
+    monkeypatch.setattr(wire_format, "WIRE_FORMAT", "binary")
+    payload, content_type = wire_format.encode(RESULTS, kind=KIND_ANALYSIS)
+    assert content_type == BINARY_CONTENT_TYPE
+    assert len(decode(payload)) == 2
+
+
+@pytest.mark.parametrize("encoder, records", [
+    (encode_telemetry, RECORDS[:3]),
+    (encode_analysis, RESULTS),
+])
+@pytest.mark.parametrize("missing", [1, 2, 6, 9])
+def test_rejects_truncated_body(encoder, records, missing):
+    payload = encoder(records)
+    with pytest.raises(ValueError, match="Truncated"):
+        decode(payload[:-missing])
+
+
+def test_rejects_truncated_node_table():
+    payload = encode_telemetry(RECORDS)
+    with pytest.raises(ValueError, match="Truncated"):
+        decode(payload[:26])
+
+
+def test_rejects_corrupt_compressed_body():
+    payload = encode_telemetry(RECORDS, compress=True)
+    with pytest.raises(ValueError):
+        decode(payload[:-3])
+
+
+def test_rejects_truncated_header():
+    with pytest.raises(ValueError, match="header"):
+        decode(encode_telemetry(RECORDS)[:10])
+
+
+def test_reasons_default_to_empty():
+    result = dict(RESULTS[0])
+    del result['fault_reasons']
+    assert decode(encode_analysis([result])).to_records()[0]['fault_reasons'] == []